@@ -0,0 +1,52 @@
+"""Cold-start import time of ``from lab1 import TextGraph``
+
+Runs the import in fresh interpreters with ``-X importtime`` and reports the
+median total plus the slowest modules (by cumulative time) of the last run.
+
+Usage: python benchmarks/bench_import.py [runs] [top]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATEMENT = "from lab1 import TextGraph"
+
+
+def import_times(statement=STATEMENT):
+    """Return ``{module: cumulative microseconds}`` for one fresh import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    runs = int(argv[0]) if argv else 5
+    top = int(argv[1]) if len(argv) > 1 else 10
+
+    totals = []
+    for _ in range(runs):
+        times = import_times()
+        totals.append(times["lab1"])
+    print(f"{STATEMENT}: median {statistics.median(totals) / 1000:.1f} ms "
+          f"over {runs} runs (min {min(totals) / 1000:.1f} ms)")
+    print("slowest modules of the last run:")
+    slowest = sorted(times.items(), key=lambda item: -item[1])[:top]
+    for module, cumulative in slowest:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+    for heavy in ("matplotlib", "networkx", "numpy"):
+        if heavy in times:
+            print(f"warning: {heavy} is imported at startup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Memory use of a TextGraph before and after freeze()
+
+Usage: python benchmarks/bench_memory.py [path]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lab1 import TextGraph  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "Cursed Be The Treasure.txt")
+
+
+def main(argv=None):
+    path = (argv or sys.argv[1:] or [DEFAULT_CORPUS])[0]
+    tracemalloc.start()
+    graph = TextGraph()
+    graph.build_graph(path)
+    gc.collect()
+    built = tracemalloc.get_traced_memory()[0]
+    graph.freeze()
+    gc.collect()
+    frozen = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    nodes, edges = len(graph.nodes), graph.compact.edge_count
+    print(f"{nodes} nodes, {edges} edges")
+    print(f"dict-of-dicts: {built / 1024:10.1f} KiB  "
+          f"({built / edges:6.1f} B/edge)")
+    print(f"frozen CSR:    {frozen / 1024:10.1f} KiB  "
+          f"({frozen / edges:6.1f} B/edge)")
+
+
+if __name__ == "__main__":
+    main()
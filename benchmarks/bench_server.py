@@ -0,0 +1,130 @@
+"""Load generator for server.py: latency percentiles under concurrent clients
+
+Starts the query server on a corpus in a subprocess, then opens --clients
+connections that each keep --depth requests in flight until --requests
+have been answered in total. Queries are a seeded mix of shortest-path,
+bridge-word and PageRank lookups; --hot makes that fraction of them repeat
+a few popular pairs, which exercises the coalescing of identical queries.
+
+Usage: python benchmarks/bench_server.py [corpus] [--clients N] [--depth N]
+                                         [--requests N] [--processes N]
+                                         [--hot FRACTION]
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lab1 import TextGraph  # noqa: E402
+from server import QueryClient  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(ROOT, "Cursed Be The Treasure.txt")
+MIX = (("path", 0.5), ("bridge", 0.4), ("pagerank", 0.1))
+
+
+def make_queries(words, count, hot=0.0, seed=0):
+    """Return count (op, params) pairs drawn from words"""
+    rng = random.Random(seed)
+    ops = [op for op, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    popular = [(rng.choice(words), rng.choice(words)) for _ in range(5)]
+    queries = []
+    for _ in range(count):
+        op = rng.choices(ops, weights)[0]
+        if rng.random() < hot:
+            word1, word2 = rng.choice(popular)
+        else:
+            word1, word2 = rng.choice(words), rng.choice(words)
+        if op == "pagerank":
+            queries.append((op, {"word": word1}))
+        else:
+            queries.append((op, {"word1": word1, "word2": word2}))
+    return queries
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run_load(path, queries, clients, depth):
+    """Send queries over clients connections; return latencies per op"""
+    latencies = {}
+    position = 0
+
+    async def worker(client):
+        nonlocal position
+        while position < len(queries):
+            op, params = queries[position]
+            position += 1
+            start = time.perf_counter()
+            await client.query(op, **params)
+            latencies.setdefault(op, []).append(time.perf_counter() - start)
+
+    connections = [await QueryClient.connect(path) for _ in range(clients)]
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(client) for client in connections
+                           for _ in range(depth)])
+    elapsed = time.perf_counter() - start
+    stats = (await connections[0].query("stats"))["result"]
+    for client in connections:
+        await client.close()
+    return latencies, elapsed, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=4,
+                        help="requests in flight per client")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--hot", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    graph = TextGraph()
+    if not graph.build_graph(args.corpus):
+        return 1
+    queries = make_queries(sorted(graph.nodes), args.requests, args.hot,
+                           args.seed)
+
+    socket_path = os.path.join(tempfile.mkdtemp(), "bench.sock")
+    command = [sys.executable, os.path.join(ROOT, "server.py"), args.corpus,
+               "--socket", socket_path]
+    if args.processes:
+        command += ["--processes", str(args.processes)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    try:
+        server.stdout.readline()        # "Serving ..." once listening
+        latencies, elapsed, stats = asyncio.run(
+            run_load(socket_path, queries, args.clients, args.depth))
+    finally:
+        server.terminate()
+        server.wait()
+
+    everything = sorted(t for values in latencies.values() for t in values)
+    print(f"{len(everything)} requests, {args.clients} clients x "
+          f"{args.depth} in flight: {len(everything) / elapsed:.0f} req/s")
+    print(f"{'op':<10} {'count':>7} {'p50 ms':>9} {'p99 ms':>9}")
+    for op, values in sorted(latencies.items()) + [("all", everything)]:
+        values = sorted(values)
+        print(f"{op:<10} {len(values):>7} "
+              f"{percentile(values, 0.5) * 1000:9.2f} "
+              f"{percentile(values, 0.99) * 1000:9.2f}")
+    print(f"coalesced: {stats['coalesced']}, errors: {stats['errors']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""Benchmark suite: core TextGraph operations on real and synthetic corpora
+
+Runs build_graph, calc_pagerank, calc_shortest_path, query_bridge_words and
+random walks on "Easy Test.txt", "Cursed Be The Treasure.txt" and on
+synthetic Zipf-distributed corpora, and reports wall time, peak RSS and
+throughput for each. Every corpus runs in a fresh process so its peak RSS
+is not inflated by the previous one. Results can be saved as JSON and
+compared with an earlier run to spot regressions between commits; with
+--repeat each corpus is run several times and the fastest time of each
+operation is kept, which steadies the comparison.
+
+peak_rss_kib is the peak RSS of the corpus's process up to the end of each
+operation, so it only ever grows along a run; it is not the memory used
+by that operation alone.
+
+Usage:
+    python benchmarks/bench_suite.py [--zipf 1e6 1e7 1e8] [--queries N]
+                                     [--repeat N] [--output results.json]
+                                     [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lab1 import TextGraph  # noqa: E402
+
+try:
+    import resource
+except ImportError:             # Windows
+    resource = None
+
+BUNDLED = {
+    "easy": os.path.join(ROOT, "Easy Test.txt"),
+    "novel": os.path.join(ROOT, "Cursed Be The Treasure.txt"),
+}
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "textgraph-corpora")
+
+
+def peak_rss_kib():
+    """Return this process's peak resident set size in KiB, or None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _word(i):
+    """Spell id i with letters only, so the tokenizer keeps it whole"""
+    letters = []
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        letters.append(chr(ord('a') + r))
+    return ''.join(reversed(letters))
+
+
+def zipf_corpus(tokens, vocabulary=50000, exponent=1.1, seed=0,
+                cache_dir=CACHE_DIR):
+    """Return the path of a cached synthetic corpus, writing it if needed
+
+    Word ranks follow a Zipf law with the given exponent; the file is
+    written in blocks of lines, so generating 10**8 tokens needs little
+    memory (but a few minutes).
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(
+        cache_dir, f"zipf-{tokens}-{vocabulary}-{exponent}-{seed}.txt")
+    if os.path.exists(path):
+        return path
+    words = [_word(i) for i in range(vocabulary)]
+    cumulative = []
+    total = 0.0
+    for rank in range(1, vocabulary + 1):
+        total += rank ** -exponent
+        cumulative.append(total)
+    rng = random.Random(seed)
+    partial = path + ".part"
+    with open(partial, "w") as f:
+        written = 0
+        while written < tokens:
+            block = min(100000, tokens - written)
+            drawn = rng.choices(words, cum_weights=cumulative, k=block)
+            for start in range(0, block, 20):
+                f.write(' '.join(drawn[start:start + 20]))
+                f.write('\n')
+            written += block
+    os.replace(partial, path)
+    return path
+
+
+def _measure(results, corpus, operation, func, items, unit):
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    results.append({
+        "corpus": corpus,
+        "operation": operation,
+        "seconds": seconds,
+        "peak_rss_kib": peak_rss_kib(),
+        "items": items,
+        "unit": unit,
+        "throughput": items / seconds if seconds > 0 else None,
+    })
+
+
+def run_corpus(corpus, path, queries=200, seed=0):
+    """Run every operation on one corpus; return the list of results"""
+    results = []
+    graph = TextGraph()
+    _measure(results, corpus, "build_graph",
+             lambda: graph.build_graph(path), 0, "tokens")
+    # Every token but the first adds one to the weight of an edge
+    tokens = sum(graph.out_weight.values()) + 1
+    results[-1].update(items=tokens,
+                       throughput=tokens / results[-1]["seconds"])
+    edges = sum(len(row) for row in graph.graph.values())
+
+    # compute_pagerank imports NumPy on first use; pay for that before
+    # timing, or small corpora would mostly measure the import
+    import pagerank  # noqa: F401
+
+    iterations = 100
+    _measure(results, corpus, "calc_pagerank",
+             lambda: graph.compute_pagerank(iterations=iterations),
+             edges * iterations, "edge-iterations")
+
+    rng = random.Random(seed)
+    words = sorted(graph.nodes)
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(queries)]
+
+    def shortest_paths():
+        for word1, word2 in pairs:
+            graph.calc_shortest_path(word1, word2)
+
+    def bridge_words():
+        for word1, word2 in pairs:
+            graph.query_bridge_words(word1, word2)
+
+    steps = 0
+
+    def walks():
+        nonlocal steps
+        for walk in graph.iter_walks(queries, seed=seed):
+            steps += len(walk)
+
+    _measure(results, corpus, "calc_shortest_path", shortest_paths,
+             queries, "queries")
+    _measure(results, corpus, "query_bridge_words", bridge_words,
+             queries, "queries")
+    _measure(results, corpus, "random_walk", walks, queries, "walks")
+    results[-1]["steps"] = steps
+    for result in results:
+        result.update(nodes=len(graph.nodes), edges=edges)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def best_of(runs):
+    """Merge repeated runs of a corpus, keeping each operation's fastest"""
+    best = list(runs[0])
+    for run in runs[1:]:
+        for i, result in enumerate(run):
+            if result["seconds"] < best[i]["seconds"]:
+                best[i] = result
+    return best
+
+
+def compare(results, baseline_path, threshold=1.2):
+    """Print the time ratio of each result against a saved run"""
+    with open(baseline_path) as f:
+        baseline = {(r["corpus"], r["operation"]): r
+                    for r in json.load(f)["results"]}
+    print(f"\nvs. {baseline_path} (ratio > 1 is slower)")
+    for result in results:
+        old = baseline.get((result["corpus"], result["operation"]))
+        if old is None or not old["seconds"]:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        flag = "  <-- regression" if ratio > threshold else ""
+        print(f"  {result['corpus']:<14} {result['operation']:<20} "
+              f"{ratio:6.2f}x{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--zipf", type=float, nargs="*", default=[1e6],
+                        metavar="TOKENS",
+                        help="synthetic corpus sizes (default: 1e6)")
+    parser.add_argument("--skip-bundled", action="store_true",
+                        help="only run the synthetic corpora")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per corpus; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", help="JSON file of an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="slowdown ratio flagged as a regression")
+    args = parser.parse_args(argv)
+
+    corpora = [] if args.skip_bundled else list(BUNDLED.items())
+    for size in args.zipf:
+        tokens = int(size)
+        corpora.append((f"zipf-{tokens:.0e}",
+                        zipf_corpus(tokens, seed=args.seed)))
+
+    results = []
+    print("(peak RSS is the process peak so far, not per operation)")
+    print(f"{'corpus':<14} {'operation':<20} {'seconds':>10} "
+          f"{'peak RSS MiB':>13} {'throughput':>22}")
+    for corpus, path in corpora:
+        # A fresh process per run keeps the peak RSS figures separate
+        runs = []
+        for _ in range(args.repeat):
+            with ProcessPoolExecutor(max_workers=1,
+                                     mp_context=get_context("spawn")) as ex:
+                runs.append(ex.submit(run_corpus, corpus, path,
+                                      args.queries, args.seed).result())
+        corpus_results = best_of(runs)
+        for r in corpus_results:
+            rss = "-" if r["peak_rss_kib"] is None \
+                else f"{r['peak_rss_kib'] / 1024:.1f}"
+            rate = f"{r['throughput']:.3g} {r['unit']}/s" \
+                if r["throughput"] else "-"
+            print(f"{r['corpus']:<14} {r['operation']:<20} "
+                  f"{r['seconds']:10.4f} {rss:>13} {rate:>22}")
+        results.extend(corpus_results)
+
+    if args.output:
+        report = {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "queries": args.queries,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to '{args.output}'")
+    if args.compare:
+        compare(results, args.compare, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Microbenchmark: tokenizer module vs. the original regex process_text
+
+Usage: python benchmarks/bench_tokenizer.py [path] [--repeat N]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tokenizer import iter_tokens, tokenize  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "Cursed Be The Treasure.txt")
+
+
+def regex_process_text(text):
+    """The original TextGraph.process_text"""
+    return re.sub(r'[^a-zA-Z]', ' ', text).lower().split()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with open(args.path, 'r') as f:
+        text = f.read()
+    expected = regex_process_text(text)
+    assert tokenize(text) == expected
+    assert list(iter_tokens(text)) == expected
+
+    candidates = [
+        ("regex re.sub + split", lambda: regex_process_text(text)),
+        ("tokenize (translate)", lambda: tokenize(text)),
+        ("iter_tokens (lazy)", lambda: sum(1 for _ in iter_tokens(text))),
+    ]
+    print(f"{len(text)} chars, {len(expected)} tokens, best of {args.repeat}")
+    baseline = None
+    for name, func in candidates:
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(f"{name:<24} {best * 1000:8.2f} ms  {baseline / best:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Lazily built two-hop index answering bridge-word queries"""
+from collections import OrderedDict
+
+from instrumentation import tally
+
+
+class BridgeIndex:
+    """Maps ``(word1, word2)`` to the bridge words ``b`` with word1 -> b -> word2
+
+    A query is answered by a probe: the successors of word1 that have an
+    edge into word2. Once the probes from a source have together cost as
+    much as walking its successors once and recording every two-hop target,
+    that row is built, after which any ``(word1, word2)`` lookup is a dict
+    probe. Rows are kept in LRU order, at most max_sources of them holding
+    at most max_entries targets in total, and the whole index is dropped
+    whenever the graph's version changes -- except after incremental
+    updates, which only drop the rows they affect (invalidate).
+    """
+
+    def __init__(self, graph, max_sources=4096, max_entries=1 << 18):
+        self._graph = graph
+        self.max_sources = max_sources
+        self.max_entries = max_entries
+        self._rows = OrderedDict()
+        self._entries = 0
+        # word1 -> successors examined by probes since its row was dropped
+        self._probed = {}
+        self._version = graph.version
+
+    def clear(self):
+        self._rows.clear()
+        self._entries = 0
+        self._probed.clear()
+        self._version = self._graph.version
+
+    def invalidate(self, words, since):
+        """Drop the rows of words after an edit from graph version since
+
+        Used by incremental updates: every other row is still valid and is
+        carried over to the new version. If the index was already stale
+        before the edit, it is cleared instead.
+        """
+        if self._version != since:
+            self.clear()
+            return
+        for word in words:
+            row = self._rows.pop(word, None)
+            if row is not None:
+                self._entries -= len(row)
+        self._version = self._graph.version
+
+    def _check_version(self):
+        if self._version != self._graph.version:
+            self.clear()
+
+    def row(self, word1):
+        """Return ``{word2: bridge words}`` for every two-hop target of word1"""
+        self._check_version()
+        row = self._rows.get(word1)
+        if row is not None:
+            self._rows.move_to_end(word1)
+            return row
+
+        # Bridges are appended in out(word1) order, the order the messages
+        # of query_bridge_words have always listed them in
+        adjacency = self._graph.graph
+        successors = adjacency.get(word1)
+        if not successors:
+            # Unknown words and sinks have no row worth keeping
+            return {}
+        lists = {}
+        for bridge in successors:
+            for word2 in adjacency.get(bridge, ()):
+                found = lists.get(word2)
+                if found is None:
+                    lists[word2] = [bridge]
+                else:
+                    found.append(bridge)
+        row = {word2: tuple(found) for word2, found in lists.items()}
+        tally('bridge_rows_built')
+
+        self._probed.pop(word1, None)
+        self._rows[word1] = row
+        self._entries += len(row)
+        # Evict least recently used rows, but never the newest one
+        while len(self._rows) > 1 and (
+                len(self._rows) > self.max_sources or
+                self._entries > self.max_entries):
+            _, evicted = self._rows.popitem(last=False)
+            self._entries -= len(evicted)
+        return row
+
+    def _hot(self, word1, successors, probes):
+        """Count probes from word1; return whether its row should be built
+
+        A row is worth building once the probes have examined as many
+        successors as building it walks two-hop edges.
+        """
+        probed = self._probed.get(word1, 0) + probes * len(successors)
+        adjacency = self._graph.graph
+        if probed >= sum(len(adjacency.get(bridge, ())) for bridge in successors):
+            return True
+        if len(self._probed) >= self.max_sources and word1 not in self._probed:
+            # Forget the sources probed so far rather than grow without bound
+            self._probed.clear()
+        self._probed[word1] = probed
+        return False
+
+    def lookup(self, word1, word2):
+        """Return the bridge words from word1 to word2 as a tuple"""
+        self._check_version()
+        row = self._rows.get(word1)
+        if row is None:
+            successors = self._graph.graph.get(word1)
+            if not successors:
+                return ()
+            if not self._hot(word1, successors, 1):
+                incoming = self._graph.predecessors.get(word2)
+                if not incoming:
+                    return ()
+                return tuple(bridge for bridge in successors
+                             if bridge in incoming)
+            row = self.row(word1)
+        else:
+            self._rows.move_to_end(word1)
+        return row.get(word2, ())
+
+    def lookup_many(self, pairs):
+        """Answer a batch of (word1, word2) pairs, in the order given
+
+        Pairs are grouped by word1 so each source is handled once per
+        batch, however the batch is ordered: from its cached row, or by
+        probing the batch's pairs one by one until the source is hot (see
+        lookup). That keeps a long document with more distinct sources
+        than max_sources from rebuilding evicted rows over and over.
+        """
+        self._check_version()
+        adjacency = self._graph.graph
+        pairs = list(pairs)
+        results = [()] * len(pairs)
+        groups = {}
+        for i, (word1, _) in enumerate(pairs):
+            groups.setdefault(word1, []).append(i)
+        incoming = {}
+        for word1, positions in groups.items():
+            if word1 not in self._rows:
+                successors = adjacency.get(word1)
+                if not successors:
+                    continue
+                if not self._hot(word1, successors, len(positions)):
+                    for i in positions:
+                        results[i] = self._probe(successors, pairs[i][1],
+                                                 incoming)
+                    continue
+            row = self.row(word1)
+            for i in positions:
+                results[i] = row.get(pairs[i][1], ())
+        return results
+
+    def _probe(self, successors, word2, incoming):
+        """Return the successors of word1 with an edge into word2
+
+        incoming caches ``{word2: set of its predecessors}`` for the batch,
+        so each test is a plain hash probe -- also on frozen graphs, where
+        looking up an edge is a bisection.
+        """
+        candidates = incoming.get(word2)
+        if candidates is None:
+            candidates = incoming[word2] = set(
+                self._graph.predecessors.get(word2, ()))
+        return tuple(bridge for bridge in successors if bridge in candidates)
@@ -0,0 +1,81 @@
+"""Parallel multi-file corpus ingestion for TextGraph.build_graph_bulk
+
+Files are split into contiguous batches. Each worker process tokenizes its
+batch and counts bigram edges into one partial ``{word1: {word2: count}}``
+map, and the parent merges the partial maps in file order.
+"""
+import glob
+import os
+
+from tokenizer import iter_chunked_tokens
+from workers import process_pool
+
+
+def expand_paths(paths):
+    """Expand a glob pattern or a list of paths/patterns into a file list"""
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    expanded = []
+    for path in paths:
+        path = os.fspath(path)
+        if glob.has_magic(path):
+            expanded.extend(sorted(glob.glob(path, recursive=True)))
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def count_batch_edges(paths, join_files=False, chunk_size=1 << 20):
+    """Count the bigram edges of consecutive files
+
+    Returns ``(first_word, last_word, edges)`` for the whole batch. Unless
+    join_files is set, no edge links the last word of one file to the first
+    word of the next.
+    """
+    edges = {}
+    first = previous = None
+    for path in paths:
+        if not join_files:
+            previous = None
+        with open(path, 'r') as file:
+            chunks = iter(lambda: file.read(chunk_size), '')
+            for word in iter_chunked_tokens(chunks):
+                if first is None:
+                    first = word
+                if previous is not None:
+                    row = edges.get(previous)
+                    if row is None:
+                        row = edges[previous] = {}
+                    row[word] = row.get(word, 0) + 1
+                previous = word
+    return first, previous, edges
+
+
+def add_edge_counts(edges, partial):
+    """Add the counts of a partial edge map into edges, in place"""
+    for word1, successors in partial.items():
+        row = edges.get(word1)
+        if row is None:
+            edges[word1] = dict(successors)
+            continue
+        for word2, count in successors.items():
+            row[word2] = row.get(word2, 0) + count
+
+
+def iter_partial_graphs(paths, processes=None, join_files=False,
+                        chunk_size=1 << 20):
+    """Yield ``(first_word, last_word, edges)`` per batch, in file order"""
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(paths) <= 1:
+        yield count_batch_edges(paths, join_files, chunk_size)
+        return
+
+    # A few batches per worker balances uneven file sizes while keeping the
+    # number of partial maps to pickle and merge small
+    batch_count = min(len(paths), processes * 4)
+    step = -(-len(paths) // batch_count)
+    batches = [paths[i:i + step] for i in range(0, len(paths), step)]
+    with process_pool(processes) as executor:
+        yield from executor.map(count_batch_edges, batches,
+                                [join_files] * len(batches),
+                                [chunk_size] * len(batches))
@@ -0,0 +1,311 @@
+"""Non-interactive command line for scripted TextGraph workloads
+
+Each subcommand loads the graph once (a text file, or a snapshot written
+by `build`) and answers a stream of queries against it, one JSON object
+per output line:
+
+    python cli.py build CORPUS... -o graph.snap [--pagerank]
+    python cli.py bridge GRAPH [QUERIES]      # lines "word1 word2"
+    python cli.py path GRAPH [QUERIES]        # lines "word1 [word2]"
+    python cli.py pagerank GRAPH [QUERIES]    # lines "word", or --top N
+    python cli.py generate GRAPH [QUERIES]    # one input text per line
+    python cli.py walk GRAPH --count N [--seed S]
+    python cli.py export GRAPH [--format tsv] [-o edges.tsv]
+
+QUERIES is a file, or stdin when omitted or "-". A query line may also be
+a JSON object with the fields the query server takes ("word1", "word2",
+"word", "text"); its "id", if any, is copied to the answer. Blank lines
+are skipped. Answers are written in query order, a block of --block-size
+lines at a time, as {"word1": ..., "word2": ..., "result": ...} or, for a
+query that cannot be answered, with an "error" field instead of "result".
+"""
+import argparse
+import json
+import sys
+from collections import deque
+
+from bulk_build import expand_paths
+from export import FORMATS, TEXT, write_lines
+from lab1 import TextGraph
+from results import WordNotFoundError
+from server import load_graph, string_field
+
+# Query fields of each subcommand, in the order plain lines give them
+FIELDS = {
+    'bridge': ('word1', 'word2'),
+    'path': ('word1', 'word2'),
+    'pagerank': ('word',),
+    'generate': ('text',),
+}
+
+
+def parse_query(line, fields):
+    """Return the query dict of one input line, or None for a blank line
+
+    Raises ValueError for malformed JSON.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        query = json.loads(line)
+        if not isinstance(query, dict):
+            raise ValueError("expected a JSON object")
+        return query
+    if fields == ('text',):
+        return {'text': line}
+    return dict(zip(fields, line.split()))
+
+
+def _bridge(graph, query):
+    return list(graph.bridge_words(string_field(query, 'word1'),
+                                   string_field(query, 'word2')))
+
+
+def _path(graph, query):
+    word1 = string_field(query, 'word1')
+    word2 = string_field(query, 'word2') if 'word2' in query else None
+    if word2:
+        found = graph.shortest_path(word1, word2)
+        if found is None:
+            return None
+        return {'length': found.length, 'path': found.path}
+    return [{'target': found.target, 'length': found.length,
+             'path': found.path} for found in graph.shortest_paths(word1)]
+
+
+def _pagerank(graph, query):
+    word = string_field(query, 'word').lower()
+    rank = graph.pagerank_rank(word)
+    if rank is None:
+        raise WordNotFoundError(word)
+    return {'score': graph.pagerank[word], 'rank': rank}
+
+
+def _generate(graph, query):
+    return graph.generate_new_text(string_field(query, 'text'))
+
+
+HANDLERS = {
+    'bridge': _bridge,
+    'path': _path,
+    'pagerank': _pagerank,
+    'generate': _generate,
+}
+
+
+def _echo(query, command):
+    """Return the id and known fields of a query, to start its answer"""
+    return {name: query[name] for name in ('id',) + FIELDS[command]
+            if name in query}
+
+
+def answer(graph, command, line):
+    """Answer one query line; returns the answer dict, or None if blank"""
+    try:
+        query = parse_query(line, FIELDS[command])
+    except ValueError as e:
+        return {'error': f"Invalid query: {e}"}
+    if query is None:
+        return None
+    response = _echo(query, command)
+    try:
+        response['result'] = HANDLERS[command](graph, query)
+    except WordNotFoundError as e:
+        response['error'] = f"Word '{e.word}' not found in graph."
+    except (KeyError, TypeError, ValueError) as e:
+        response['error'] = f"Invalid query: {e}"
+    return response
+
+
+def answer_lines(graph, command, lines):
+    """Yield the JSON answer line of every non-blank query line"""
+    for line in lines:
+        response = answer(graph, command, line)
+        if response is not None:
+            yield json.dumps(response) + '\n'
+
+
+def generate_lines(graph, lines, seed=None, processes=1):
+    """Yield the JSON answer lines of generate queries, in order
+
+    The texts go through TextGraph.generate_new_texts, so they are handled
+    a batch at a time, in a process pool if processes is not 1; with a
+    seed, the n-th text always gets the same output.
+    """
+    # (response, done) per query in input order; responses of valid
+    # queries are completed as their texts come back
+    pending = deque()
+
+    def texts():
+        for line in lines:
+            try:
+                query = parse_query(line, FIELDS['generate'])
+            except ValueError as e:
+                pending.append(({'error': f"Invalid query: {e}"}, True))
+                continue
+            if query is None:
+                continue
+            response = _echo(query, 'generate')
+            try:
+                text = string_field(query, 'text')
+            except (KeyError, ValueError) as e:
+                response['error'] = f"Invalid query: {e}"
+                pending.append((response, True))
+                continue
+            pending.append((response, False))
+            yield text
+
+    for text in graph.generate_new_texts(texts(), seed=seed,
+                                         processes=processes):
+        # Texts are read ahead a batch at a time; flush the errors queued
+        # before the query this text answers
+        while pending[0][1]:
+            yield json.dumps(pending.popleft()[0]) + '\n'
+        response, _ = pending.popleft()
+        response['result'] = text
+        yield json.dumps(response) + '\n'
+    while pending:
+        yield json.dumps(pending.popleft()[0]) + '\n'
+
+
+def _open_input(path):
+    if path == '-':
+        return sys.stdin
+    return open(path)
+
+
+def _output(path):
+    return sys.stdout if path == '-' else path
+
+
+def _run_queries(graph, args):
+    source = _open_input(args.queries)
+    if args.command == 'generate':
+        lines = generate_lines(graph, source, args.seed, args.processes)
+    else:
+        lines = answer_lines(graph, args.command, source)
+    try:
+        write_lines(lines, _output(args.output), args.block_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def _top_pagerank(graph, args):
+    lines = (json.dumps({'word': word, 'result': {'score': score,
+                                                  'rank': rank}}) + '\n'
+             for rank, (word, score) in
+             enumerate(graph.top_pagerank(args.top), 1))
+    write_lines(lines, _output(args.output), args.block_size)
+
+
+def _walks(graph, args):
+    walks = graph.iter_walks(args.count, seed=args.seed,
+                             max_length=args.max_length, start=args.start)
+    write_lines((json.dumps({'result': walk}) + '\n' for walk in walks),
+                _output(args.output), args.block_size)
+
+
+def _build(args):
+    graph = TextGraph()
+    paths = expand_paths(args.corpus)
+    if len(paths) == 1:
+        built = graph.build_graph(paths[0])
+    else:
+        built = graph.build_graph_bulk(paths, args.processes,
+                                       join_files=args.join_files)
+    if not built:
+        return 1
+    if args.pagerank:
+        graph.compute_pagerank()
+    graph.save(args.output)
+    print(json.dumps({'output': args.output, 'nodes': len(graph.nodes),
+                      'edges': sum(map(len, graph.graph.values()))}))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="build and save a snapshot")
+    build.add_argument('corpus', nargs='+', help="text files or globs")
+    build.add_argument('-o', '--output', required=True,
+                       help="snapshot file to write")
+    build.add_argument('--pagerank', action='store_true',
+                       help="compute PageRank and store it in the snapshot")
+    build.add_argument('--processes', type=int)
+    build.add_argument('--join-files', action='store_true',
+                       help="chain the files instead of keeping them apart")
+
+    for name, help in (('bridge', "bridge words of word pairs"),
+                       ('path', "shortest paths"),
+                       ('pagerank', "PageRank scores and ranks"),
+                       ('generate', "insert bridge words into texts"),
+                       ('walk', "random walks"),
+                       ('export', "write the edge list")):
+        command = commands.add_parser(name, help=help)
+        command.add_argument('graph', help="text file or graph snapshot")
+        if name in FIELDS:
+            command.add_argument('queries', nargs='?', default='-',
+                                 help="query file (default: stdin)")
+        command.add_argument('-o', '--output', default='-',
+                             help="output file (default: stdout)")
+        command.add_argument('--block-size', type=int, default=4096,
+                             help="output lines per write")
+
+    commands.choices['pagerank'].add_argument(
+        '--top', type=int, help="list the top N words instead of queries")
+    generate = commands.choices['generate']
+    generate.add_argument('--seed', type=int,
+                          help="seed the choice of bridge words")
+    generate.add_argument('--processes', type=int, default=1,
+                          help="worker processes (0: one per CPU)")
+    walk = commands.choices['walk']
+    walk.add_argument('--count', type=int, default=1)
+    walk.add_argument('--seed', type=int)
+    walk.add_argument('--max-length', type=int)
+    walk.add_argument('--start', help="start every walk from this word")
+    export = commands.choices['export']
+    export.add_argument('--format', choices=FORMATS, default=TEXT)
+    export.add_argument('--sort-by-weight', action='store_true')
+    export.add_argument('--limit', type=int)
+    export.add_argument('--no-header', action='store_true',
+                        help="omit the header row of TSV and CSV output")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'build':
+        return _build(args)
+
+    graph = load_graph(args.graph)
+    if graph is None:
+        return 1
+    if args.command == 'export':
+        graph.export_edges(_output(args.output), args.format,
+                           args.sort_by_weight, args.limit,
+                           header=not args.no_header)
+    elif args.command == 'walk':
+        if args.start is not None:
+            args.start = args.start.lower()
+            if args.start not in graph.nodes:
+                print(f"Error: Word '{args.start}' not found in graph.",
+                      file=sys.stderr)
+                return 1
+        try:
+            _walks(graph, args)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    elif args.command == 'pagerank' and args.top is not None:
+        _top_pagerank(graph, args)
+    else:
+        _run_queries(graph, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
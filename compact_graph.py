@@ -0,0 +1,279 @@
+"""Frozen, array-backed representation of a TextGraph
+
+Words are interned to dense integer ids (in sorted order, so comparing ids
+orders words the same way as comparing strings) and edges are stored as
+CSR-style ``array('I')`` offsets, targets and weights. The views at the
+bottom of this module expose the arrays through the same mapping interface
+as the dict-of-dicts, so TextGraph methods run unchanged on a frozen graph.
+"""
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Set
+
+
+class CompactGraph:
+    """Integer-interned CSR graph with both forward and reverse adjacency
+
+    Forward rows (``offsets``/``targets``/``weights``) keep the insertion
+    order of the original successor dicts. Reverse rows (``in_offsets``/
+    ``sources``/``in_weights``) are sorted by source id and double as the
+    lookup structure for ``weight(source, target)`` via binary search.
+    """
+
+    def __init__(self, words, offsets, targets, weights,
+                 in_offsets, sources, in_weights, out_totals, in_totals):
+        self.words = words
+        self.ids = {word: i for i, word in enumerate(words)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.in_offsets = in_offsets
+        self.sources = sources
+        self.in_weights = in_weights
+        self.out_totals = out_totals
+        self.in_totals = in_totals
+
+    @classmethod
+    def from_dicts(cls, nodes, graph):
+        """Freeze a node set and a ``{source: {target: weight}}`` adjacency"""
+        words = sorted(nodes)
+        ids = {word: i for i, word in enumerate(words)}
+        n = len(words)
+
+        offsets = array('I', [0])
+        targets = array('I')
+        weights = array('I')
+        out_totals = array('Q', bytes(8 * n))
+        in_totals = array('Q', bytes(8 * n))
+        in_counts = [0] * n
+        for i, word in enumerate(words):
+            total = 0
+            for target, weight in graph.get(word, {}).items():
+                j = ids[target]
+                targets.append(j)
+                weights.append(weight)
+                in_counts[j] += 1
+                in_totals[j] += weight
+                total += weight
+            out_totals[i] = total
+            offsets.append(len(targets))
+
+        # Counting sort of the edges by target; sources are visited in id
+        # order, so every reverse row comes out sorted
+        in_offsets = array('I', [0])
+        for count in in_counts:
+            in_offsets.append(in_offsets[-1] + count)
+        fill = array('I', in_offsets[:-1])
+        sources = array('I', bytes(4 * len(targets)))
+        in_weights = array('I', bytes(4 * len(targets)))
+        for i in range(n):
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                sources[fill[j]] = i
+                in_weights[fill[j]] = weights[k]
+                fill[j] += 1
+
+        return cls(words, offsets, targets, weights,
+                   in_offsets, sources, in_weights, out_totals, in_totals)
+
+    def __getstate__(self):
+        # Memory-mapped sections cannot be pickled; copy them into arrays.
+        # The word -> id table is rebuilt on the other side
+        state = {}
+        for name, value in self.__dict__.items():
+            if isinstance(value, memoryview):
+                copy = array(value.format)
+                copy.frombytes(value)
+                value = copy
+            state[name] = value
+        del state['ids']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.ids = {word: i for i, word in enumerate(self.words)}
+
+    def __len__(self):
+        return len(self.words)
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    def edge_position(self, source, target):
+        """Return the reverse-row position of source -> target, or -1"""
+        lo, hi = self.in_offsets[target], self.in_offsets[target + 1]
+        k = bisect_left(self.sources, source, lo, hi)
+        if k < hi and self.sources[k] == source:
+            return k
+        return -1
+
+    def to_dicts(self):
+        """Thaw back into ``(nodes, graph, predecessors)`` plain dicts"""
+        words = self.words
+        graph = {}
+        predecessors = {}
+        for i, word in enumerate(words):
+            lo, hi = self.offsets[i], self.offsets[i + 1]
+            if lo < hi:
+                graph[word] = {words[j]: w for j, w in
+                               zip(self.targets[lo:hi], self.weights[lo:hi])}
+            lo, hi = self.in_offsets[i], self.in_offsets[i + 1]
+            if lo < hi:
+                predecessors[word] = {
+                    words[j]: w for j, w in
+                    zip(self.sources[lo:hi], self.in_weights[lo:hi])}
+        return set(words), graph, predecessors
+
+
+class NodeView(Set):
+    """Read-only set of the words of a CompactGraph"""
+
+    def __init__(self, compact):
+        self._compact = compact
+
+    def __contains__(self, word):
+        return word in self._compact.ids
+
+    def __iter__(self):
+        return iter(self._compact.words)
+
+    def __len__(self):
+        return len(self._compact.words)
+
+
+class TotalsView(Mapping):
+    """Read-only ``{word: total weight}`` mapping over a totals array"""
+
+    def __init__(self, compact, totals):
+        self._compact = compact
+        self._totals = totals
+
+    def __getitem__(self, word):
+        return self._totals[self._compact.ids[word]]
+
+    def __iter__(self):
+        return iter(self._compact.words)
+
+    def __len__(self):
+        return len(self._compact.words)
+
+
+class AdjacencyView(Mapping):
+    """Read-only ``{word: row}`` mapping over one direction of the CSR arrays
+
+    Like the defaultdict it replaces, only words with at least one edge in
+    this direction are keys.
+    """
+
+    def __init__(self, compact, reverse=False):
+        self._compact = compact
+        self._reverse = reverse
+        self._offsets = compact.in_offsets if reverse else compact.offsets
+        offsets = self._offsets
+        self._size = sum(1 for i in range(len(compact.words))
+                         if offsets[i] < offsets[i + 1])
+
+    def _row(self, i):
+        if self._reverse:
+            return PredecessorRow(self._compact, i)
+        return SuccessorRow(self._compact, i)
+
+    def __getitem__(self, word):
+        i = self._compact.ids[word]
+        if self._offsets[i] == self._offsets[i + 1]:
+            raise KeyError(word)
+        return self._row(i)
+
+    def __contains__(self, word):
+        i = self._compact.ids.get(word)
+        return i is not None and self._offsets[i] < self._offsets[i + 1]
+
+    def __iter__(self):
+        offsets = self._offsets
+        for i, word in enumerate(self._compact.words):
+            if offsets[i] < offsets[i + 1]:
+                yield word
+
+    def __len__(self):
+        return self._size
+
+
+class SuccessorRow(Mapping):
+    """Read-only ``{target: weight}`` row of one source, in insertion order"""
+
+    def __init__(self, compact, source):
+        self._compact = compact
+        self._source = source
+        self._lo = compact.offsets[source]
+        self._hi = compact.offsets[source + 1]
+
+    def __getitem__(self, word):
+        compact = self._compact
+        k = compact.edge_position(self._source, compact.ids[word])
+        if k < 0:
+            raise KeyError(word)
+        return compact.in_weights[k]
+
+    def __contains__(self, word):
+        target = self._compact.ids.get(word)
+        return target is not None and \
+            self._compact.edge_position(self._source, target) >= 0
+
+    def __iter__(self):
+        words = self._compact.words
+        for j in self._compact.targets[self._lo:self._hi]:
+            yield words[j]
+
+    def __len__(self):
+        return self._hi - self._lo
+
+    def items(self):
+        compact = self._compact
+        words = compact.words
+        return [(words[j], w) for j, w in zip(
+            compact.targets[self._lo:self._hi],
+            compact.weights[self._lo:self._hi])]
+
+    def values(self):
+        return self._compact.weights[self._lo:self._hi]
+
+
+class PredecessorRow(Mapping):
+    """Read-only ``{source: weight}`` row of one target, sorted by source"""
+
+    def __init__(self, compact, target):
+        self._compact = compact
+        self._target = target
+        self._lo = compact.in_offsets[target]
+        self._hi = compact.in_offsets[target + 1]
+
+    def __getitem__(self, word):
+        compact = self._compact
+        k = compact.edge_position(compact.ids[word], self._target)
+        if k < 0:
+            raise KeyError(word)
+        return compact.in_weights[k]
+
+    def __contains__(self, word):
+        source = self._compact.ids.get(word)
+        return source is not None and \
+            self._compact.edge_position(source, self._target) >= 0
+
+    def __iter__(self):
+        words = self._compact.words
+        for i in self._compact.sources[self._lo:self._hi]:
+            yield words[i]
+
+    def __len__(self):
+        return self._hi - self._lo
+
+    def items(self):
+        compact = self._compact
+        words = compact.words
+        return [(words[i], w) for i, w in zip(
+            compact.sources[self._lo:self._hi],
+            compact.in_weights[self._lo:self._hi])]
+
+    def values(self):
+        return self._compact.in_weights[self._lo:self._hi]
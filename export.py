@@ -0,0 +1,139 @@
+"""Buffered edge-list export in text, TSV, CSV and Graphviz DOT formats
+
+Edges are formatted into blocks of lines and written with one write() call
+per block, instead of one print() per edge, so dumping a large graph is
+bound by formatting rather than terminal or pipe I/O. Output goes to a
+file path (a named pipe works too) or any writable text stream such as
+sys.stdout or a subprocess pipe.
+"""
+import csv
+import heapq
+import io
+import os
+from itertools import islice
+
+TEXT = 'text'
+TSV = 'tsv'
+CSV = 'csv'
+DOT = 'dot'
+FORMATS = (TEXT, TSV, CSV, DOT)
+
+
+def iter_edges(graph, sort_by_weight=False, limit=None):
+    """Yield ``(source, target, weight)`` for the edges of a TextGraph
+
+    Edges come in adjacency order, or heaviest first with sort_by_weight
+    (ties keep adjacency order). limit caps the number of edges; with
+    sort_by_weight only the limit heaviest are selected, not all sorted.
+    """
+    edges = ((source, target, weight)
+             for source, successors in graph.graph.items()
+             for target, weight in successors.items())
+    if sort_by_weight:
+        if limit is not None:
+            yield from heapq.nlargest(limit, edges, key=_weight)
+            return
+        yield from sorted(edges, key=_weight, reverse=True)
+        return
+    if limit is None:
+        yield from edges
+        return
+    for count, edge in enumerate(edges):
+        if count >= limit:
+            return
+        yield edge
+
+
+def _weight(edge):
+    return edge[2]
+
+
+def _dot_id(word):
+    escaped = word.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _text_lines(edges):
+    for source, target, weight in edges:
+        yield f"{source} -> {target} [weight={weight}]\n"
+
+
+def _dot_lines(edges):
+    yield "digraph G {\n"
+    for source, target, weight in edges:
+        yield f"  {_dot_id(source)} -> {_dot_id(target)} [weight={weight}];\n"
+    yield "}\n"
+
+
+def _delimited_lines(edges, delimiter, header, block_size=4096):
+    # csv takes care of quoting; rows are formatted a block at a time into
+    # a StringIO and handed out as one multi-line string per block
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator='\n')
+    if header:
+        writer.writerow(('source', 'target', 'weight'))
+    edges = iter(edges)
+    while True:
+        block = list(islice(edges, block_size))
+        writer.writerows(block)
+        if buffer.tell():
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if len(block) < block_size:
+            return
+
+
+def format_edges(edges, format=TEXT, header=True):
+    """Yield the output for an iterable of edges as newline-terminated text
+
+    Each item is one line, or a block of lines for TSV and CSV.
+    """
+    if format == TEXT:
+        return _text_lines(edges)
+    if format == DOT:
+        return _dot_lines(edges)
+    if format in (TSV, CSV):
+        return _delimited_lines(edges, '\t' if format == TSV else ',',
+                                header)
+    raise ValueError(f"Unknown export format '{format}' "
+                     f"(expected one of {', '.join(FORMATS)}).")
+
+
+def write_lines(lines, out, block_size=4096):
+    """Write text items to out, joined into one write() per block_size items
+
+    out is a file path or a writable text stream.
+    """
+    if isinstance(out, (str, os.PathLike)):
+        with open(out, 'w', buffering=1 << 16) as file:
+            write_lines(lines, file, block_size)
+            return
+    block = []
+    for line in lines:
+        block.append(line)
+        if len(block) >= block_size:
+            out.write(''.join(block))
+            block.clear()
+    if block:
+        out.write(''.join(block))
+    out.flush()
+
+
+def export_edges(graph, out, format=TEXT, sort_by_weight=False, limit=None,
+                 header=True):
+    """Write the edges of graph to out and return the number of edges
+
+    header adds a ``source, target, weight`` row to TSV and CSV output.
+    """
+    count = 0
+
+    def counted(edges):
+        nonlocal count
+        for edge in edges:
+            count += 1
+            yield edge
+
+    edges = counted(iter_edges(graph, sort_by_weight, limit))
+    write_lines(format_edges(edges, format, header), out)
+    return count
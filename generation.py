@@ -0,0 +1,133 @@
+"""Batch and streamed bridge-word text generation
+
+The rule is the one generate_new_text has always used: after each word,
+insert one of the bridge words to the next word, chosen uniformly, if
+there are any. Here it is applied to many texts at once, or to a document
+read in chunks, with bridge words looked up through the graph's
+BridgeIndex a batch of pairs at a time.
+
+Seeded output is reproducible: text i of a batch draws from its own
+generator derived from (seed, i) (see walks.batch_rng), so the result for
+a text does not depend on the batch size or the number of processes.
+Without a seed, choices come from the random module like those of
+generate_new_text; in a process pool, from each worker's own state.
+"""
+import os
+import random
+from itertools import chain, islice
+
+from instrumentation import tally
+from tokenizer import iter_chunked_tokens
+from walks import batch_rng
+from workers import graph_pool, windowed_map, worker_graph
+
+
+def _insert_bridges(words, bridges, rng):
+    """Join words, inserting a choice from each non-empty bridge tuple"""
+    if not words:
+        return ""
+    new_text = []
+    for word, found in zip(words, bridges):
+        new_text.append(word)
+        if found:
+            new_text.append(rng.choice(found))
+    new_text.append(words[-1])
+    return ' '.join(new_text)
+
+
+def generate_batch(graph, texts, seed=None, first=0):
+    """Return the generated text of each of texts, in order
+
+    Text i uses the generator batch_rng(seed, first + i), or the random
+    module when seed is None, as generate_new_text does. The bridge words
+    of all pairs in the batch are fetched with one lookup_many call, so
+    each source word is probed or its row fetched once per batch.
+    """
+    token_lists = [graph.process_text(text) for text in texts]
+    pairs = [pair for words in token_lists for pair in zip(words, words[1:])]
+    tally('tokens', sum(map(len, token_lists)))
+    bridges = graph.bridge_index.lookup_many(pairs)
+    results = []
+    position = 0
+    for i, words in enumerate(token_lists):
+        count = max(len(words) - 1, 0)
+        rng = random if seed is None else batch_rng(seed, first + i)
+        results.append(_insert_bridges(
+            words, bridges[position:position + count], rng))
+        position += count
+    return results
+
+
+def _run_batch(texts, seed, first):
+    return generate_batch(worker_graph(), texts, seed, first)
+
+
+def _batches(texts, batch_size):
+    batch = []
+    first = 0
+    for text in texts:
+        batch.append(text)
+        if len(batch) >= batch_size:
+            yield first, batch
+            first += len(batch)
+            batch = []
+    if batch:
+        yield first, batch
+
+
+def iter_generate(graph, texts, seed=None, processes=1, batch_size=1000):
+    """Yield the generated text of each of texts, in order
+
+    texts may be any iterable, e.g. the lines of a file; it is consumed a
+    batch of batch_size texts at a time. With processes other than 1,
+    batches run in a process pool (all CPUs when processes is None) with a
+    few batches per worker in flight, so memory stays bounded. A single
+    batch is always generated in-process.
+    """
+    batches = _batches(texts, batch_size)
+    processes = processes or os.cpu_count() or 1
+    if processes != 1:
+        # Look ahead: a single batch is not worth starting a pool for
+        started = list(islice(batches, 2))
+        batches = chain(started, batches)
+        if len(started) < 2:
+            processes = 1
+    if processes == 1:
+        for first, batch in batches:
+            yield from generate_batch(graph, batch, seed, first)
+        return
+
+    with graph_pool(graph, processes) as executor:
+        tasks = ((batch, seed, first) for first, batch in batches)
+        for results in windowed_map(executor, _run_batch, tasks,
+                                    window=processes * 2):
+            yield from results
+
+
+def iter_generate_document(graph, chunks, rng=random, batch_size=4096):
+    """Yield the output words of generate_new_text for a chunked document
+
+    chunks is an iterable of text pieces, e.g. a file read in blocks; the
+    result is the same as generate_new_text(''.join(chunks)).split() with
+    the same random state, without holding the document in memory.
+    """
+    tokens = iter_chunked_tokens(chunks)
+    previous = next(tokens, None)
+    if previous is None:
+        return
+    index = graph.bridge_index
+    while True:
+        words = [previous]
+        for word in tokens:
+            words.append(word)
+            if len(words) > batch_size:
+                break
+        pairs = list(zip(words, words[1:]))
+        for (word, _), found in zip(pairs, index.lookup_many(pairs)):
+            yield word
+            if found:
+                yield rng.choice(found)
+        previous = words[-1]
+        if len(words) <= batch_size:
+            yield previous
+            return
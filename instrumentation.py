@@ -0,0 +1,249 @@
+"""Opt-in timing and work counters for TextGraph operations
+
+Nothing is measured until a sink is installed with enable() (or the
+instrument() context manager). Public TextGraph methods are wrapped with
+@instrumented, which then times each call as a Span; code running inside
+a span adds work counters (tokens, heap pops, PageRank sweeps, walk steps)
+with tally() and point values (the final PageRank residual) with gauge().
+When a span ends it is handed to the sink as a Record, and its counters
+are added to the enclosing span, so calc_pagerank also reports the sweeps
+of the compute_pagerank call it made.
+
+Disabled, the wrappers cost one global lookup and a None check per call,
+and tally()/gauge() return at once; hot loops keep their tallies in local
+variables and report them once per call.
+
+Sinks are objects with an emit(record) method: LoggingSink, JsonLinesSink
+and HistogramSink below, or anything else with that method.
+"""
+import functools
+import os
+import time
+from typing import NamedTuple
+
+_sink = None        # Where finished spans go; None disables everything
+_current = None     # Innermost running Span
+
+
+class Record(NamedTuple):
+    """One finished span: a method call, its duration and its counters"""
+    name: str
+    start: float        # time.time() when the call began
+    seconds: float
+    counters: dict
+    values: dict
+    depth: int          # 0 for outermost calls
+
+
+class Span:
+    """A running timed section; use timer() rather than creating one"""
+
+    __slots__ = ('name', 'counters', 'values', 'parent', 'depth',
+                 '_start', '_wall')
+
+    def __init__(self, name):
+        self.name = name
+        self.counters = {}
+        self.values = {}
+
+    def __enter__(self):
+        global _current
+        self.parent = _current
+        self.depth = 0 if _current is None else _current.depth + 1
+        _current = self
+        self._wall = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        global _current
+        seconds = time.perf_counter() - self._start
+        _current = self.parent
+        parent = self.parent
+        if parent is not None:
+            for name, value in self.counters.items():
+                parent.counters[name] = parent.counters.get(name, 0) + value
+        sink = _sink
+        if sink is not None:
+            sink.emit(Record(self.name, self._wall, seconds, self.counters,
+                             self.values, self.depth))
+        return False
+
+
+class _NullTimer:
+    """Shared do-nothing context manager handed out while disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def enable(sink):
+    """Send spans to sink from now on; returns the previous sink"""
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+def disable():
+    """Stop measuring; returns the sink that was installed"""
+    return enable(None)
+
+
+def enabled():
+    return _sink is not None
+
+
+class instrument:
+    """``with instrument(sink):`` measures only inside the block"""
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def __enter__(self):
+        self._previous = enable(self.sink)
+        return self.sink
+
+    def __exit__(self, *exc_info):
+        enable(self._previous)
+        return False
+
+
+def timer(name):
+    """Return a context manager timing the block as a span called name"""
+    if _sink is None:
+        return _NULL_TIMER
+    return Span(name)
+
+
+def instrumented(func):
+    """Time every call of func as a span named after its qualified name"""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _sink is None:
+            return func(*args, **kwargs)
+        with Span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def tally(name, value=1):
+    """Add value to counter name of the innermost running span"""
+    span = _current
+    if span is not None:
+        counters = span.counters
+        counters[name] = counters.get(name, 0) + value
+
+
+def gauge(name, value):
+    """Record a point value (e.g. a residual) on the innermost span"""
+    span = _current
+    if span is not None:
+        span.values[name] = value
+
+
+class LoggingSink:
+    """Log one line per span through the logging module (default level INFO)"""
+
+    def __init__(self, logger=None, level=None):
+        # logging and json are only imported once a sink is created, to
+        # keep them out of the import of lab1
+        import logging
+
+        self.logger = logger or logging.getLogger('textgraph')
+        self.level = logging.INFO if level is None else level
+
+    def emit(self, record):
+        if not self.logger.isEnabledFor(self.level):
+            return
+        details = ' '.join(f"{name}={value}" for name, value in
+                           {**record.counters, **record.values}.items())
+        self.logger.log(self.level, "%s%s took %.3f ms %s",
+                        '  ' * record.depth, record.name,
+                        record.seconds * 1000, details)
+
+
+class JsonLinesSink:
+    """Write each span as one JSON object per line to a path or stream"""
+
+    def __init__(self, out):
+        import json
+
+        self._dumps = json.dumps
+        if isinstance(out, (str, os.PathLike)):
+            self._file = open(out, 'a')
+            self._owned = True
+        else:
+            self._file = out
+            self._owned = False
+
+    def emit(self, record):
+        self._file.write(self._dumps(record._asdict()) + '\n')
+
+    def close(self):
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class HistogramSink:
+    """Aggregate spans in memory: per-name latency histograms and totals
+
+    Durations are bucketed by powers of two microseconds, so memory stays
+    constant however many calls are recorded; percentiles are reported as
+    the upper edge of the bucket they fall in.
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def emit(self, record):
+        stats = self.stats.get(record.name)
+        if stats is None:
+            stats = self.stats[record.name] = {
+                'calls': 0, 'seconds': 0.0, 'max': 0.0,
+                'buckets': {}, 'counters': {}}
+        stats['calls'] += 1
+        stats['seconds'] += record.seconds
+        stats['max'] = max(stats['max'], record.seconds)
+        bucket = int(record.seconds * 1e6).bit_length()
+        stats['buckets'][bucket] = stats['buckets'].get(bucket, 0) + 1
+        counters = stats['counters']
+        for name, value in record.counters.items():
+            counters[name] = counters.get(name, 0) + value
+
+    def percentile(self, name, fraction):
+        """Return an upper bound in seconds on the fraction-quantile"""
+        stats = self.stats[name]
+        rank = fraction * stats['calls']
+        seen = 0
+        for bucket in sorted(stats['buckets']):
+            seen += stats['buckets'][bucket]
+            if seen >= rank:
+                return min((1 << bucket) / 1e6, stats['max'])
+        return stats['max']
+
+    def summary(self):
+        """Return ``{name: {calls, total, mean, p50, p99, max, counters}}``"""
+        return {name: {
+            'calls': stats['calls'],
+            'total': stats['seconds'],
+            'mean': stats['seconds'] / stats['calls'],
+            'p50': self.percentile(name, 0.5),
+            'p99': self.percentile(name, 0.99),
+            'max': stats['max'],
+            'counters': dict(stats['counters']),
+        } for name, stats in self.stats.items()}
+
+    def clear(self):
+        self.stats.clear()
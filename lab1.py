@@ -1,118 +1,511 @@
-import re
+import os
 import random
+import select
+import sys
 import heapq
 from collections import defaultdict
-import matplotlib.pyplot as plt
-import networkx as nx
-import msvcrt  # Windows-specific module for keyboard input
 import time
 
+from bridge_index import BridgeIndex
+from bulk_build import (add_edge_counts, count_batch_edges, expand_paths,
+                        iter_partial_graphs)
+from compact_graph import AdjacencyView, CompactGraph, NodeView, TotalsView
+from export import TEXT, export_edges
+from generation import iter_generate, iter_generate_document
+from instrumentation import gauge, instrumented, tally
+from path_cache import PathCache, walk_back
+from path_store import ShortestPathStore
+from rendering import BY_PAGERANK, LayoutCache, render, select_subgraph
+from results import PathResult, WordNotFoundError
+from sampling import AliasTable
+from snapshot import load_snapshot, save_snapshot
+from tokenizer import tokenize
+from walks import DEAD_END, generate_walks, iter_walk, iter_walks
+
 
 class TextGraph:
     def __init__(self):
-        self.graph = defaultdict(dict)  # Adjacency list representation
-        self.nodes = set()              # All unique words/nodes
+        self._graph = defaultdict(dict)  # Adjacency list representation
+        self._nodes = set()              # All unique words/nodes
         self.pagerank = {}              # PageRank values
+        self.pagerank_iterations = 0    # Sweeps run by the last calc_pagerank
+        self.pagerank_residual = None   # L1 change of the last sweep
+        # (version, damping, iterations, tol) self.pagerank was computed
+        # with, and the ranking cached over it
+        self._pagerank_key = None
+        self._ranking = None
+        # Reverse adjacency (in-edges) and weight totals, kept in sync with
+        # self.graph by _add_edge
+        self.predecessors = defaultdict(dict)
+        self.out_weight = defaultdict(int)
+        self.in_weight = defaultdict(int)
+        self.compact = None             # CompactGraph while frozen
+        self.version = 0                # Bumped on every edge change
+        self.bridge_index = BridgeIndex(self)
+        self.path_store = None          # ShortestPathStore, if precomputed
+        self.path_cache = PathCache(self)  # Searches of recent queries
+        self._samplers = {}             # word -> AliasTable of successors
+        self._samplers_version = 0
+        self._walk_starts = None        # Words a random walk may start from
+        self.snapshot_path = None       # Set when loaded from a snapshot
+        self.layout_cache = LayoutCache()  # Positions of drawn subgraphs
+
+    @property
+    def graph(self):
+        """Adjacency map ``{word1: {word2: weight}}``
+
+        Edit the graph through build_graph_from_text, add_document or
+        remove_document, which keep the in-edge index and the caches in
+        step. Assigning a new map is allowed and reindexes the graph (its
+        words become self.nodes); after editing the map in place, call
+        rebuild_index().
+        """
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph):
+        if self.compact is not None:
+            raise RuntimeError("Graph is frozen; call thaw() before editing it.")
+        self._graph = defaultdict(dict, graph)
+        self._nodes = set()
+        self.rebuild_index()
+
+    @property
+    def nodes(self):
+        """Set of all words; add isolated words by assigning a new set"""
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes):
+        if self.compact is not None:
+            raise RuntimeError("Graph is frozen; call thaw() before editing it.")
+        self._nodes = set(nodes)
+        self.version += 1
 
     def process_text(self, text):
         """Process raw text into words, ignoring punctuation and case"""
-        # Replace all non-alphabetic characters with spaces and lowercase
-        text = re.sub(r'[^a-zA-Z]', ' ', text).lower()
-        words = text.split()
-        return words
-
-    def build_graph(self, file_path):
-        """Build the directed graph from a text file"""
+        return tokenize(text)
+
+    @instrumented
+    def build_graph(self, file_path, chunk_size=1 << 20):
+        """Build the directed graph from a text file
+
+        The file is read and tokenized chunk_size characters at a time, so
+        peak memory follows the vocabulary and edge count rather than the
+        corpus size. The result is identical to tokenizing the whole file.
+        Edges are counted into a separate map and only added once the whole
+        file has been read, so a read error leaves the graph unchanged.
+        """
         try:
-            with open(file_path, 'r') as file:
-                text = file.read()
-                words = self.process_text(text)
-
-                if not words:
-                    print("Error: File is empty or contains no valid words.")
-                    return False
+            first, _, edges = count_batch_edges([file_path],
+                                                chunk_size=chunk_size)
+        except FileNotFoundError:
+            print(f"Error: File '{file_path}' not found.")
+            return False
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            return False
 
-                # Build edges between consecutive words
-                for i in range(len(words) - 1):
-                    word1, word2 = words[i], words[i + 1]
-                    self.nodes.add(word1)
-                    self.nodes.add(word2)
+        if first is None:
+            print("Error: File is empty or contains no valid words.")
+            return False
+        try:
+            self.merge_edges(edges)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return False
+        # One edge per token but the first
+        tally('tokens', sum(sum(row.values()) for row in edges.values()) + 1)
+        return True
 
-                    # Update edge weight (count of consecutive occurrences)
-                    if word2 in self.graph[word1]:
-                        self.graph[word1][word2] += 1
-                    else:
-                        self.graph[word1][word2] = 1
+    @instrumented
+    def build_graph_bulk(self, paths, processes=None, join_files=False):
+        """Build the graph from many text files using a process pool
+
+        paths is a glob pattern or a list of paths/patterns. Each file is
+        tokenized and counted in a worker and the partial edge maps are
+        merged here. Edges only cross file boundaries with join_files=True,
+        in which case files are chained in the order given.
+        """
+        paths = expand_paths(paths)
+        if not paths:
+            print("Error: No input files found.")
+            return False
+        tally('files', len(paths))
 
-                return True
-        except FileNotFoundError:
-            print(f"Error: File '{file_path}' not found.")
+        # Partial maps are combined first and added to the graph only when
+        # every file has been read, so a failure leaves the graph unchanged
+        edges = {}
+        found_words = False
+        previous_last = None
+        try:
+            for first, last, partial in iter_partial_graphs(
+                    paths, processes, join_files):
+                if first is None:
+                    continue
+                found_words = True
+                if join_files and previous_last is not None:
+                    add_edge_counts(edges, {previous_last: {first: 1}})
+                previous_last = last
+                add_edge_counts(edges, partial)
+        except FileNotFoundError as e:
+            print(f"Error: File '{e.filename}' not found.")
             return False
         except Exception as e:
             print(f"Error reading file: {e}")
             return False
 
+        if not found_words:
+            print("Error: Files are empty or contain no valid words.")
+            return False
+        try:
+            self.merge_edges(edges)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return False
+        return True
+
+    def merge_edges(self, edges):
+        """Add a {word1: {word2: count}} map of edge counts to the graph"""
+        for word1, successors in edges.items():
+            for word2, count in successors.items():
+                self._add_edge(word1, word2, count)
+
     def build_graph_from_text(self, text):
         """Build graph directly from a raw text string"""
+        return self.add_document(text)
+
+    @instrumented
+    def add_document(self, text):
+        """Add the bigram counts of text to the graph
+
+        Derived caches are updated for the affected words only (see
+        _apply_document). Returns False if text contains no words.
+        """
+        return self._apply_document(text, remove=False)
+
+    @instrumented
+    def remove_document(self, text):
+        """Subtract the bigram counts of a previously added text
+
+        Edges whose weight drops to zero are deleted, and so are words left
+        without any edge. Raises ValueError, leaving the graph unchanged, if
+        some bigram of text does not occur in the graph often enough.
+        Returns False if text contains no words.
+        """
+        return self._apply_document(text, remove=True)
+
+    def _apply_document(self, text, remove):
+        """Add or subtract the bigrams of text and refresh derived caches
+
+        Instead of dropping every cache on the version bump, only the
+        entries the edit can have changed are discarded: bridge rows of the
+        edited sources and their predecessors, and the successor samplers
+        of the edited sources. PageRank goes stale by version and is
+        warm-started from the old scores by top_pagerank / pagerank_rank;
+        the shortest-path store is dropped.
+        """
+        if self.compact is not None:
+            raise RuntimeError("Graph is frozen; call thaw() before editing it.")
         words = self.process_text(text)
         if not words:
             return False
-        for i in range(len(words) - 1):
-            word1, word2 = words[i], words[i + 1]
-            self.nodes.add(word1)
-            self.nodes.add(word2)
-            self.graph[word1][word2] = self.graph[word1].get(word2, 0) + 1
+        tally('tokens', len(words))
+        pairs = list(zip(words, words[1:]))
+        if remove:
+            counts = {}
+            for pair in pairs:
+                counts[pair] = counts.get(pair, 0) + 1
+            for (word1, word2), count in counts.items():
+                weight = self.graph.get(word1, {}).get(word2, 0)
+                if weight < count:
+                    raise ValueError(
+                        f"Edge '{word1}' -> '{word2}' occurs {weight} times "
+                        f"in the graph, cannot remove {count}.")
+
+        since = self.version
+        sources = {word1 for word1, _ in pairs}
+        had_edges = {word for word in sources if word in self.graph}
+        for word1, word2 in pairs:
+            if remove:
+                self._remove_edge(word1, word2)
+            else:
+                self._add_edge(word1, word2)
+        if self.version == since:
+            return True
+
+        # Any edited edge can change distances from any source, so stored
+        # shortest paths (precompute_shortest_paths) are released, not kept
+        # around stale until the next precompute
+        self.path_store = None
+        affected = set(sources)
+        for word in sources:
+            affected.update(self.predecessors.get(word, ()))
+        self.bridge_index.invalidate(affected, since)
+        if self._samplers_version == since:
+            for word in sources:
+                self._samplers.pop(word, None)
+            self._samplers_version = self.version
+        if self._walk_starts is not None and self._walk_starts[0] == since \
+                and had_edges == {w for w in sources if w in self.graph}:
+            self._walk_starts = (self.version, self._walk_starts[1])
         return True
 
-    def show_directed_graph(self, save_to_file=False):
-        """Display the directed graph (CLI or optionally save as image)"""
+    def _add_edge(self, word1, word2, count=1):
+        """Add count occurrences of word1 -> word2 to the graph and its indexes"""
+        if self.compact is not None:
+            raise RuntimeError("Graph is frozen; call thaw() before editing it.")
+        self.nodes.add(word1)
+        self.nodes.add(word2)
+        # Update edge weight (count of consecutive occurrences)
+        successors = self.graph[word1]
+        successors[word2] = successors.get(word2, 0) + count
+        predecessors = self.predecessors[word2]
+        predecessors[word1] = predecessors.get(word1, 0) + count
+        self.out_weight[word1] += count
+        self.in_weight[word2] += count
+        self.version += 1
+
+    def _remove_edge(self, word1, word2, count=1):
+        """Subtract count occurrences of word1 -> word2, pruning empty entries"""
+        if self.compact is not None:
+            raise RuntimeError("Graph is frozen; call thaw() before editing it.")
+        successors = self.graph.get(word1)
+        if successors is None or word2 not in successors:
+            raise KeyError((word1, word2))
+        count = min(count, successors[word2])
+        predecessors = self.predecessors[word2]
+        weight = successors[word2] - count
+        if weight > 0:
+            successors[word2] = weight
+            predecessors[word1] = weight
+        else:
+            del successors[word2]
+            del predecessors[word1]
+            if not successors:
+                del self.graph[word1]
+            if not predecessors:
+                del self.predecessors[word2]
+        self.out_weight[word1] -= count
+        if self.out_weight[word1] <= 0:
+            del self.out_weight[word1]
+        self.in_weight[word2] -= count
+        if self.in_weight[word2] <= 0:
+            del self.in_weight[word2]
+        # A word with neither in- nor out-edges leaves the graph
+        for word in (word1, word2):
+            if word not in self.graph and word not in self.predecessors:
+                self.nodes.discard(word)
+        self.version += 1
+
+    def rebuild_index(self):
+        """Recompute the in-edge index and weight totals from self.graph
+
+        Only needed after editing self.graph or self.nodes in place instead
+        of going through build_graph / build_graph_from_text; the words of
+        every edge are added to self.nodes. Also bumps the graph version so
+        derived caches (bridge rows, path searches, PageRank, samplers) are
+        dropped.
+        """
+        if self.compact is not None:
+            raise RuntimeError("Graph is frozen; call thaw() before editing it.")
+        self.predecessors = defaultdict(dict)
+        self.out_weight = defaultdict(int)
+        self.in_weight = defaultdict(int)
+        for word1, successors in self.graph.items():
+            self.nodes.add(word1)
+            for word2, weight in successors.items():
+                self.nodes.add(word2)
+                self.predecessors[word2][word1] = weight
+                self.out_weight[word1] += weight
+                self.in_weight[word2] += weight
+        self.version += 1
+
+    @property
+    def frozen(self):
+        return self.compact is not None
+
+    @instrumented
+    def freeze(self):
+        """Switch to the compact, read-only representation
+
+        Words are interned to integer ids and edges moved into CSR arrays
+        (see compact_graph.CompactGraph). self.graph, self.predecessors,
+        self.nodes and the weight totals become read-only views over those
+        arrays, so every query method keeps working unchanged.
+        """
+        if self.compact is None:
+            self._use_compact(CompactGraph.from_dicts(self.nodes, self.graph))
+        return self
+
+    def _use_compact(self, compact):
+        """Point the graph attributes at views over a CompactGraph"""
+        self.compact = compact
+        self._graph = AdjacencyView(compact)
+        self.predecessors = AdjacencyView(compact, reverse=True)
+        self._nodes = NodeView(compact)
+        self.out_weight = TotalsView(compact, compact.out_totals)
+        self.in_weight = TotalsView(compact, compact.in_totals)
+
+    @instrumented
+    def save(self, path, include_pagerank=True):
+        """Save the graph to a binary snapshot file (see snapshot.py)
+
+        The cached PageRank scores and their parameters are stored as well
+        unless include_pagerank is False or they have not been computed.
+        Scores computed before the last graph change are refreshed first,
+        so the file never holds a stale vector.
+        """
+        pagerank = parameters = None
+        if include_pagerank and self.pagerank:
+            self._pagerank_ranking()
+            parameters = self._pagerank_key[1:]
+        compact = self.compact
+        if compact is None:
+            compact = CompactGraph.from_dicts(self.nodes, self.graph)
+        if parameters is not None:
+            pagerank = [self.pagerank[word] for word in compact.words]
+        save_snapshot(compact, path, pagerank, parameters)
+
+    @classmethod
+    @instrumented
+    def load(cls, path):
+        """Open a snapshot file as a frozen, memory-mapped graph"""
+        compact, pagerank, parameters = load_snapshot(path)
+        graph = cls()
+        graph._use_compact(compact)
+        graph.snapshot_path = os.fspath(path)
+        if pagerank is not None:
+            graph.pagerank = dict(zip(compact.words, pagerank))
+            # Fresh for this graph; the parameters are None in files
+            # written before they were recorded
+            graph._pagerank_key = (graph.version, *parameters)
+        return graph
+
+    def shared_state(self):
+        """Return a picklable description of the graph for worker processes
+
+        A graph loaded from a snapshot is described by the file path, so
+        every worker maps the same pages; otherwise the compact arrays are
+        sent. Rebuild the graph with from_shared_state.
+        """
+        if self.snapshot_path is not None and self.version == 0:
+            return ('snapshot', self.snapshot_path)
+        compact = self.compact
+        if compact is None:
+            compact = CompactGraph.from_dicts(self.nodes, self.graph)
+        return ('compact', compact)
+
+    @classmethod
+    def from_shared_state(cls, state):
+        """Rebuild a frozen graph from shared_state() in a worker process"""
+        kind, payload = state
+        if kind == 'snapshot':
+            return cls.load(payload)
+        graph = cls()
+        graph._use_compact(payload)
+        return graph
+
+    @instrumented
+    def thaw(self):
+        """Switch back to the mutable dict-of-dicts representation"""
+        if self.compact is None:
+            return self
+        nodes, graph, predecessors = self.compact.to_dicts()
+        self.compact = None
+        self._nodes = nodes
+        self._graph = defaultdict(dict, graph)
+        self.predecessors = defaultdict(dict, predecessors)
+        self.out_weight = defaultdict(int)
+        self.in_weight = defaultdict(int)
+        for word1, successors in graph.items():
+            self.out_weight[word1] = sum(successors.values())
+        for word2, sources in predecessors.items():
+            self.in_weight[word2] = sum(sources.values())
+        return self
+
+    def _bridge_words(self, word1, word2):
+        """Return the words b with word1 -> b -> word2, in out(word1) order"""
+        return self.bridge_index.lookup(word1, word2)
+
+    @instrumented
+    def show_directed_graph(self, save_to_file=False, top=None,
+                            by=BY_PAGERANK, around=None, hops=1,
+                            min_weight=None, max_nodes=200, max_edges=500,
+                            path="graph_visualization.png"):
+        """Display the directed graph (CLI or optionally save as image)
+
+        The image shows a filtered subgraph of at most max_nodes nodes and
+        max_edges edges: the hops-neighbourhood of around, edges of at
+        least min_weight, and the top nodes by PageRank or degree (see
+        rendering.py).
+        """
         if not self.graph:
             print("Graph is empty. Please build the graph first.")
             return
 
         print("\nDirected Graph Representation:")
-        for source in self.graph:
-            for target, weight in self.graph[source].items():
-                print(f"{source} -> {target} [weight={weight}]")
+        self.export_edges(sys.stdout)
 
         # Optional: Save as image using NetworkX and Matplotlib
         if save_to_file:
+            if around is not None:
+                around = around.lower()
+                if around not in self.nodes:
+                    print(f"Word '{around}' not found in graph.")
+                    return
             try:
-                nx_graph = nx.DiGraph()
-                for source in self.graph:
-                    for target, weight in self.graph[source].items():
-                        nx_graph.add_edge(source, target, weight=weight)
-
-                plt.figure(figsize=(12, 8))
-                pos = nx.spring_layout(nx_graph)
-                nx.draw(nx_graph, pos, with_labels=True, node_size=2000, node_color='skyblue',
-                        font_size=10, font_weight='bold', arrowsize=20)
-                edge_labels = nx.get_edge_attributes(nx_graph, 'weight')
-                nx.draw_networkx_edge_labels(
-                    nx_graph, pos, edge_labels=edge_labels)
-
-                plt.title("Directed Graph Visualization")
-                plt.savefig("graph_visualization.png")
-                print("\nGraph visualization saved as 'graph_visualization.png'")
+                nodes, edges = select_subgraph(
+                    self, top=top, by=by, around=around, hops=hops,
+                    min_weight=min_weight, max_nodes=max_nodes,
+                    max_edges=max_edges)
+                positions = self.layout_cache.layout(nodes, edges)
+                render(nodes, edges, positions, path)
+                print(f"\nGraph visualization saved as '{path}'")
             except Exception as e:
                 print(f"Warning: Could not generate graph image. {e}")
 
+    @instrumented
+    def export_edges(self, out, format=TEXT, sort_by_weight=False,
+                     limit=None, header=True):
+        """Write the edge list to a file path or stream; return the edge count
+
+        format is 'text' (the show_directed_graph listing), 'tsv', 'csv' or
+        'dot'. Lines are written in large blocks, so this also suits pipes
+        feeding other tools. See export.py.
+        """
+        return export_edges(self, out, format=format,
+                            sort_by_weight=sort_by_weight, limit=limit,
+                            header=header)
+
+    def _require_words(self, *words):
+        """Raise WordNotFoundError for the first word not in the graph"""
+        for word in words:
+            if word not in self.nodes:
+                raise WordNotFoundError(word)
+
+    @instrumented
+    def bridge_words(self, word1, word2):
+        """Return the bridge words from word1 to word2 as a tuple
+
+        Raises WordNotFoundError if either word is not in the graph.
+        """
+        word1 = word1.lower()
+        word2 = word2.lower()
+        self._require_words(word1, word2)
+        return self._bridge_words(word1, word2)
+
+    @instrumented
     def query_bridge_words(self, word1, word2):
         """Find bridge words between word1 and word2"""
         word1 = word1.lower()
         word2 = word2.lower()
 
-        if word1 not in self.nodes or word2 not in self.nodes:
+        try:
+            bridge_words = self.bridge_words(word1, word2)
+        except WordNotFoundError:
             return f"No {word1} or {word2} in the graph!"
 
-        bridge_words = []
-        # Find all words that word1 points to
-        if word1 in self.graph:
-            for potential_bridge in self.graph[word1]:
-                # Check if potential_bridge points to word2
-                if word2 in self.graph.get(potential_bridge, {}):
-                    bridge_words.append(potential_bridge)
-
         if not bridge_words:
             return f"No bridge words from {word1} to {word2}!"
         else:
@@ -123,6 +516,19 @@ class TextGraph:
                 bridge_list = bridge_words[0]
             return f"The bridge words from {word1} to {word2} are: {bridge_list}."
 
+    @instrumented
+    def query_bridge_words_batch(self, pairs):
+        """Answer many (word1, word2) bridge queries in one call
+
+        Returns one entry per pair: the list of bridge words (possibly
+        empty), or None when either word is not in the graph.
+        """
+        pairs = [(word1.lower(), word2.lower()) for word1, word2 in pairs]
+        found = self.bridge_index.lookup_many(pairs)
+        return [list(bridges) if word1 in self.nodes and word2 in self.nodes
+                else None for (word1, word2), bridges in zip(pairs, found)]
+
+    @instrumented
     def generate_new_text(self, input_text):
         """Generate new text by inserting bridge words"""
         words = self.process_text(input_text)
@@ -137,11 +543,7 @@ class TextGraph:
             new_text.append(word1)
 
             # Find bridge words
-            bridge_words = []
-            if word1 in self.graph:
-                for potential_bridge in self.graph[word1]:
-                    if word2 in self.graph.get(potential_bridge, {}):
-                        bridge_words.append(potential_bridge)
+            bridge_words = self._bridge_words(word1, word2)
 
             # Insert a random bridge word if any exist
             if bridge_words:
@@ -150,114 +552,251 @@ class TextGraph:
         new_text.append(words[-1])  # Add the last word
         return ' '.join(new_text)
 
+    def generate_new_texts(self, texts, seed=None, processes=1,
+                           batch_size=1000):
+        """Yield generate_new_text of each of texts, in order
+
+        Bridge words are looked up a batch of texts at a time, batches can
+        run in a process pool, and with a seed every output is reproducible
+        whatever the batch size and process count. Without a seed, choices
+        come from the random module's state, as in generate_new_text and
+        generate_document. See generation.py.
+        """
+        return iter_generate(self, texts, seed=seed, processes=processes,
+                             batch_size=batch_size)
+
+    def generate_document(self, source, seed=None, chunk_size=1 << 20):
+        """Yield the words generate_new_text would give for a whole document
+
+        source is a file path or an iterable of text chunks; the document
+        is read and processed chunk_size characters at a time. Uses the
+        random module's state unless a seed is given.
+        """
+        rng = random if seed is None else random.Random(seed)
+        if isinstance(source, (str, os.PathLike)):
+            return self._generate_file(source, rng, chunk_size)
+        return iter_generate_document(self, source, rng)
+
+    def _generate_file(self, path, rng, chunk_size):
+        with open(path, 'r') as file:
+            chunks = iter(lambda: file.read(chunk_size), '')
+            yield from iter_generate_document(self, chunks, rng)
+
+    @instrumented
     def calc_shortest_path(self, word1, word2=None):
         """Calculate shortest path between two words or from one word to all others"""
         word1 = word1.lower()
         if word2:
             word2 = word2.lower()
 
-        if word1 not in self.nodes:
-            return f"{word1} not found in graph!"
-        if word2 and word2 not in self.nodes:
-            return f"{word2} not found in graph!"
-
-        # Dijkstra's algorithm
-        distances = {node: float('inf') for node in self.nodes}
-        distances[word1] = 0
-        previous = {node: None for node in self.nodes}
-        visited = set()
-
-        priority_queue = [(0, word1)]
+        try:
+            if word2:
+                found = self.shortest_path(word1, word2)
+            else:
+                paths = self.shortest_paths(word1)
+        except WordNotFoundError as e:
+            return f"{e.word} not found in graph!"
 
-        while priority_queue:
-            current_dist, current_node = heapq.heappop(priority_queue)
+        # Handle two word case
+        if word2:
+            if found is None:
+                return f"No path exists from {word1} to {word2}!"
+            return f"Shortest path from {word1} to {word2}: {' -> '.join(found.path)} (length: {found.length})"
 
-            if current_node in visited:
+        # Handle single word case (find all shortest paths from word1)
+        result = [
+            f"Shortest path from {word1} to {found.target}: {
+                ' -> '.join(found.path)} (length: {found.length})"
+            for found in paths]
+        return '\n'.join(
+            result) if result else f"No paths found from {word1} to other nodes."
+
+    @instrumented
+    def shortest_path(self, word1, word2):
+        """Return the shortest word1 -> word2 path as a PathResult, or None
+
+        Searches from word1 are kept in self.path_cache until the graph
+        changes, so repeated queries and other targets from the same source
+        reuse them. Raises WordNotFoundError if either word is not in the
+        graph.
+        """
+        word1 = word1.lower()
+        word2 = word2.lower()
+        self._require_words(word1, word2)
+        store = self._stored_paths(word1)
+        if store is not None:
+            found = store.path(word1, word2)
+        else:
+            found = self.path_cache.find(word1, word2)
+        if found is None:
+            return None
+        return PathResult(word1, word2, *found)
+
+    @instrumented
+    def shortest_paths(self, word1):
+        """Return an iterator of PathResults from word1 to every reachable word
+
+        The search runs up front, but each path is only reconstructed as
+        the iterator reaches it. Raises WordNotFoundError if word1 is not
+        in the graph.
+        """
+        word1 = word1.lower()
+        self._require_words(word1)
+        store = self._stored_paths(word1)
+        if store is not None:
+            return self._iter_stored_paths(store, word1)
+
+        search = self.path_cache.search(word1)
+        return (PathResult(word1, target, *search.result(target))
+                for target in self.nodes
+                if target != word1 and target in search.settled)
+
+    def _iter_stored_paths(self, store, word1):
+        for target in self.nodes:
+            if target != word1:
+                found = store.path(word1, target)
+                if found is not None:
+                    yield PathResult(word1, target, *found)
+
+    def _walk_back(self, previous, target):
+        """Reconstruct the path to target from a predecessor map"""
+        return walk_back(previous, target)
+
+    @instrumented
+    def precompute_shortest_paths(self, sources=None, processes=None):
+        """Precompute shortest paths from many source words in parallel
+
+        Runs single-source Dijkstra from each source (all words by default)
+        in a process pool and keeps the distance and predecessor arrays in
+        self.path_store. calc_shortest_path then answers queries from those
+        sources without searching, until the graph changes.
+        """
+        compact = self.compact
+        if compact is None:
+            compact = CompactGraph.from_dicts(self.nodes, self.graph)
+        if sources is not None:
+            sources = [word.lower() for word in sources]
+        self.path_store = ShortestPathStore.build(
+            compact, sources, processes, version=self.version)
+        tally('path_sources', len(self.path_store))
+        return self.path_store
+
+    def _stored_paths(self, word1):
+        """Return the path store if it holds fresh results for word1"""
+        store = self.path_store
+        if store is not None and store.version == self.version and \
+                word1 in store:
+            return store
+        return None
+
+    def _bidirectional_path(self, source, target):
+        """Return (length, path) of the shortest source -> target path, or None
+
+        Bidirectional Dijkstra: one search runs forward over self.graph from
+        source, the other backward over self.predecessors from target, and
+        both only allocate state for the nodes they reach. They stop once
+        the two frontier keys add up to the best meeting distance.
+
+        To return the same path as a plain forward Dijkstra when several are
+        equally short, the forward search is then resumed (it pops nodes in
+        the same (distance, word) order) until it settles target, skipping
+        every node whose backward lower bound proves it is off all shortest
+        paths, A*-style. That second phase only touches the region between
+        the two frontiers. self.predecessors must be consistent with
+        self.graph (see rebuild_index).
+        """
+        if source == target:
+            return 0, [source]
+
+        adjacency = (self.graph, self.predecessors)
+        distances = ({source: 0}, {target: 0})
+        previous = ({source: None}, {target: None})
+        settled = (set(), set())
+        queues = ([(0, source)], [(0, target)])
+        best = float('inf')
+        pops = 0
+
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+            # Advance the side whose frontier is closer
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            current_dist, current_node = heapq.heappop(queues[side])
+            pops += 1
+            if current_node in settled[side]:
                 continue
-            visited.add(current_node)
+            settled[side].add(current_node)
 
-            if word2 and current_node == word2:
+            dist, prev = distances[side], previous[side]
+            other = distances[1 - side]
+            for neighbor, weight in adjacency[side].get(current_node, {}).items():
+                distance = current_dist + weight
+                if distance < dist.get(neighbor, float('inf')):
+                    dist[neighbor] = distance
+                    prev[neighbor] = current_node
+                    heapq.heappush(queues[side], (distance, neighbor))
+                if neighbor in other and distance + other[neighbor] < best:
+                    best = distance + other[neighbor]
+
+        if best == float('inf'):
+            self._tally_heap(pops, queues)
+            return None
+
+        # Resume the forward search, pruning nodes that cannot lie on a
+        # shortest path: unsettled backward nodes are at least the backward
+        # frontier key away from target
+        queue, dist, prev = queues[0], distances[0], previous[0]
+        done, backward, backward_done = settled[0], distances[1], settled[1]
+        frontier = queues[1][0][0] if queues[1] else float('inf')
+        while target not in done and queue:
+            current_dist, current_node = heapq.heappop(queue)
+            pops += 1
+            if current_node in done:
+                continue
+            done.add(current_node)
+            if current_node == target:
                 break
-
+            if current_node in backward_done:
+                bound = backward[current_node]
+            else:
+                bound = frontier
+            if current_dist + bound > best:
+                continue
             for neighbor, weight in self.graph.get(current_node, {}).items():
                 distance = current_dist + weight
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
-                    previous[neighbor] = current_node
-                    heapq.heappush(priority_queue, (distance, neighbor))
-
-        # Handle single word case (find all shortest paths from word1)
-        if not word2:
-            result = []
-            for target in self.nodes:
-                if target != word1 and distances[target] != float('inf'):
-                    path = []
-                    node = target
-                    while node is not None:
-                        path.append(node)
-                        node = previous[node]
-                    path.reverse()
-                    result.append(
-                        f"Shortest path from {word1} to {target}: {
-                            ' -> '.join(path)} (length: {
-                            distances[target]})")
-            return '\n'.join(
-                result) if result else f"No paths found from {word1} to other nodes."
-
-        # Handle two word case
-        if distances[word2] == float('inf'):
-            return f"No path exists from {word1} to {word2}!"
-
-        # Reconstruct path
-        path = []
-        node = word2
-        while node is not None:
-            path.append(node)
-            node = previous[node]
-        path.reverse()
-
-        return f"Shortest path from {word1} to {word2}: {' -> '.join(path)} (length: {distances[word2]})"
-
-    def calc_pagerank(self, word=None, damping=0.85, iterations=100):
-        """Calculate PageRank for all nodes or a specific node"""
+                if distance < dist.get(neighbor, float('inf')):
+                    dist[neighbor] = distance
+                    prev[neighbor] = current_node
+                    heapq.heappush(queue, (distance, neighbor))
+
+        self._tally_heap(pops, queues)
+        if target not in done:
+            return None
+
+        return dist[target], self._walk_back(prev, target)
+
+    @staticmethod
+    def _tally_heap(pops, queues):
+        # Every push is either popped or still queued; the seeds were not pushed
+        tally('heap_pops', pops)
+        tally('heap_pushes', pops + sum(map(len, queues)) - len(queues))
+
+    @instrumented
+    def calc_pagerank(self, word=None, damping=0.85, iterations=100,
+                      tol=None, warm_start=False):
+        """Calculate PageRank for all nodes or a specific node
+
+        The keyword arguments are passed to compute_pagerank. Scores are
+        only recomputed when the graph or the parameters have changed since
+        the last call.
+        """
         if not self.graph:
             return "Graph is empty. Please build the graph first."
 
-        # Initialize PR values
-        N = len(self.nodes)
-        pr = {node: 1 / N for node in self.nodes}
-
-        for _ in range(iterations):
-            new_pr = {}
-            # Calculate total PR from dangling nodes (nodes with no outgoing
-            # edges)
-            dangling_pr = 0
-            for node in self.nodes:
-                # Node is dangling if it has no outgoing edges or isn't in the
-                # graph as a source
-                if node not in self.graph or not self.graph[node]:
-                    dangling_pr += pr[node]
-            # Distribute dangling PR equally among all nodes
-            dangling_contribution = dangling_pr / N if N > 0 else 0
-
-            for node in self.nodes:
-                # Calculate sum of PR of incoming nodes divided by their
-                # out-degree
-                incoming_sum = 0
-                for incoming_node in [
-                        n for n in self.graph if node in self.graph[n]]:
-                    outgoing_links = sum(self.graph[incoming_node].values())
-                    if outgoing_links > 0:
-                        incoming_sum += pr[incoming_node] * \
-                            (self.graph[incoming_node][node] / outgoing_links)
-
-                # Apply PageRank formula with dangling node contribution
-                new_pr[node] = (1 - damping) / N + damping * \
-                    (incoming_sum + dangling_contribution)
-
-            pr = new_pr
-
-        self.pagerank = pr
+        # Reuse the scores while the graph and parameters are unchanged
+        if self._pagerank_key != (self.version, damping, iterations, tol):
+            self.compute_pagerank(damping, iterations, tol=tol,
+                                  warm_start=warm_start)
 
         if word:
             word = word.lower()
@@ -267,61 +806,146 @@ class TextGraph:
                 return f"Word '{word}' not found in graph."
         else:
             # Return top 10 nodes by PageRank
-            sorted_pr = sorted(
-                self.pagerank.items(),
-                key=lambda x: x[1],
-                reverse=True)
             result = "Top 10 nodes by PageRank:\n"
-            for i, (node, score) in enumerate(sorted_pr[:10], 1):
+            for i, (node, score) in enumerate(self.top_pagerank(10), 1):
                 result += f"{i}. {node}: {score:.4f}\n"
             return result
 
+    @instrumented
+    def compute_pagerank(self, damping=0.85, iterations=100, tol=None,
+                         warm_start=False):
+        """Compute PageRank for every node and return the {word: score} dict
+
+        With ``tol`` the iteration stops early once the L1 residual drops
+        below it (``iterations`` is then an upper bound). ``warm_start``
+        resumes from the previous ``self.pagerank`` instead of the uniform
+        vector, which converges in a few sweeps after small graph updates.
+        The number of sweeps run and the final residual are stored in
+        ``pagerank_iterations`` and ``pagerank_residual``.
+        """
+        # Imported here so that loading lab1 does not pull in NumPy
+        from pagerank import PageRankEngine, PageRankRanking
+
+        # Compile the adjacency dict into a CSR transition matrix once and
+        # run vectorized power iterations over it
+        if self.compact is not None:
+            engine = PageRankEngine.from_compact(self.compact)
+        else:
+            engine = PageRankEngine.from_index(
+                self.nodes, self.predecessors, self.out_weight)
+        start = None
+        if warm_start and self.pagerank:
+            start = engine.warm_start(self.pagerank)
+        scores, self.pagerank_iterations, self.pagerank_residual = engine.run(
+            damping, iterations, tol=tol, start=start)
+        tally('pagerank_iterations', self.pagerank_iterations)
+        gauge('pagerank_residual', self.pagerank_residual)
+        self.pagerank = engine.to_dict(scores)
+        self._pagerank_key = (self.version, damping, iterations, tol)
+        self._ranking = PageRankRanking(engine.nodes, scores, self.pagerank)
+        return self.pagerank
+
+    def _pagerank_ranking(self):
+        """Return the ranking of self.pagerank, refreshing stale scores
+
+        Scores are recomputed (warm-started, with the previous parameters)
+        only if the graph changed since they were computed.
+        """
+        key = self._pagerank_key
+        if not self.pagerank or key is None or key[0] != self.version:
+            params = key[1:] if key is not None and key[1] is not None else ()
+            self.compute_pagerank(*params, warm_start=bool(self.pagerank))
+        if self._ranking is None or self._ranking.source is not self.pagerank:
+            from pagerank import PageRankRanking
+            self._ranking = PageRankRanking.from_dict(self.pagerank)
+        return self._ranking
+
+    def top_pagerank(self, k=10):
+        """Return an iterator over the k best (word, score) pairs
+
+        Uses a partial selection instead of sorting every score, and caches
+        the result until the scores change. Ties keep the order of
+        self.pagerank.
+        """
+        return iter(self._pagerank_ranking().top(k))
+
+    def pagerank_rank(self, word):
+        """Return the 1-based PageRank rank of word, or None if not in graph"""
+        return self._pagerank_ranking().rank(word.lower())
+
+    def sample_successor(self, word, rng=random):
+        """Draw a successor of word with probability proportional to weight
+
+        Uses a Walker alias table built on first use and cached until the
+        graph changes, so each draw is O(1) regardless of out-degree.
+        Returns None if word has no outgoing edges. rng is any object with a
+        random() method, the random module by default.
+        """
+        if self._samplers_version != self.version:
+            self._samplers = {}
+            self._samplers_version = self.version
+        table = self._samplers.get(word)
+        if table is None:
+            successors = self.graph.get(word)
+            if not successors:
+                return None
+            items = list(successors.items())
+            table = AliasTable([node for node, _ in items],
+                               [weight for _, weight in items])
+            self._samplers[word] = table
+        return table.sample(rng)
+
+    def walk_starts(self):
+        """Return the words with outgoing edges, cached until the graph changes
+
+        Sorted, so seeded walks agree between the dict and frozen forms.
+        """
+        if self._walk_starts is None or self._walk_starts[0] != self.version:
+            self._walk_starts = (self.version, sorted(self.graph.keys()))
+        return self._walk_starts[1]
+
+    def iter_walks(self, count, seed=None, max_length=None, start=None):
+        """Yield count headless random walks as lists of words (see walks.py)"""
+        return iter_walks(self, count, seed=seed, max_length=max_length,
+                          start=start)
+
+    @instrumented
+    def generate_walks(self, count, out, seed=None, max_length=None,
+                       start=None, processes=None, batch_size=1000):
+        """Stream count random walks to a file or callback using a process pool"""
+        return generate_walks(self, count, out, seed=seed,
+                              max_length=max_length, start=start,
+                              processes=processes, batch_size=batch_size)
+
+    @instrumented
     def random_walk(self):
         """Perform a random walk until a repeated edge is encountered or no outgoing edges"""
         if not self.graph:
             return "Graph is empty. Please build the graph first."
 
         # Choose a random starting node
-        current_node = random.choice(list(self.graph.keys()))
-        path = [current_node]
-        visited_edges = set()
+        steps = iter_walk(self)
+        path = [next(steps)]
 
         print("Random walk started. Press Enter to stop at any time.")
 
         try:
             while True:
-                # Check if current node has outgoing edges
-                if current_node not in self.graph or not self.graph[current_node]:
-                    print(
-                        f"Stopping: Node '{current_node}' has no outgoing edges.")
-                    break
-
-                # Get all possible next nodes and their weights
-                next_nodes = list(self.graph[current_node].items())
-                total_weight = sum(weight for _, weight in next_nodes)
-
-                # Choose next node based on edge weights
-                rand_val = random.uniform(0, total_weight)
-                cumulative = 0
-                for node, weight in next_nodes:
-                    cumulative += weight
-                    if rand_val <= cumulative:
-                        next_node = node
-                        break
-
-                # Check if we've seen this edge before
-                edge = (current_node, next_node)
-                if edge in visited_edges:
-                    print(
-                        f"Stopping: Repeated edge {current_node} -> {next_node} encountered.")
+                # Move to a next node chosen based on edge weights, unless
+                # the walk has reached a dead end or a repeated edge
+                try:
+                    path.append(next(steps))
+                except StopIteration as stop:
+                    reason, detail = stop.value
+                    if reason == DEAD_END:
+                        print(
+                            f"Stopping: Node '{detail}' has no outgoing edges.")
+                    else:
+                        print(
+                            f"Stopping: Repeated edge {detail[0]} -> {detail[1]} encountered.")
                     break
-                visited_edges.add(edge)
-
-                # Move to next node
-                current_node = next_node
-                path.append(current_node)
 
-                # Check for user input to stop (Windows-compatible)
+                # Check for user input to stop
                 if self._check_user_stop():
                     print("User stopped the random walk.")
                     break
@@ -332,6 +956,8 @@ class TextGraph:
         except KeyboardInterrupt:
             print("\nUser stopped the random walk.")
 
+        tally('walk_steps', len(path))
+
         # Save to file
         walk_text = ' '.join(path)
         try:
@@ -344,7 +970,18 @@ class TextGraph:
         return walk_text
 
     def _check_user_stop(self):
-        """Check if user wants to stop the random walk (Windows-compatible)"""
+        """Check if user wants to stop the random walk (Enter key pressed)"""
+        try:
+            import msvcrt  # Windows-specific module for keyboard input
+        except ImportError:
+            # Elsewhere, Enter makes a line readable on an interactive stdin
+            try:
+                if not sys.stdin.isatty():
+                    return False
+                ready, _, _ = select.select([sys.stdin], [], [], 0)
+            except (OSError, ValueError):
+                return False
+            return bool(ready) and sys.stdin.readline() != ''
         return msvcrt.kbhit() and msvcrt.getch() == b'\r'  # Enter key pressed
 
 
@@ -377,7 +1014,12 @@ def main():
         if choice == '1':
             save = input(
                 "Save graph visualization to file? (y/n): ").lower() == 'y'
-            graph.show_directed_graph(save_to_file=save)
+            around = None
+            if save:
+                around = input("Center the image on a word "
+                               "(leave blank for the top nodes): ").strip()
+            graph.show_directed_graph(save_to_file=save,
+                                      around=around or None)
 
         elif choice == '2':
             word1 = input("Enter first word: ").strip()
@@ -0,0 +1,203 @@
+"""LRU cache of resumable single-source shortest-path searches"""
+import heapq
+from collections import OrderedDict
+
+from instrumentation import tally
+
+
+class SourceSearch:
+    """Forward Dijkstra from one source that can stop and be resumed later
+
+    Words are settled in (distance, word) order, the order of a plain
+    forward Dijkstra, and the predecessor of a settled word never changes
+    afterwards; so the path to a word is the same whether the search
+    stopped there, was resumed to reach it, or ran to completion.
+    """
+
+    __slots__ = ('source', 'distances', 'previous', 'settled', 'queue')
+
+    def __init__(self, source):
+        self.source = source
+        self.distances = {source: 0}
+        self.previous = {source: None}
+        self.settled = set()
+        self.queue = [(0, source)]
+
+    def __len__(self):
+        """Number of words reached so far"""
+        return len(self.distances)
+
+    @property
+    def complete(self):
+        return not self.queue
+
+    def settle(self, adjacency, target=None):
+        """Advance until target is settled, or to completion if target is None
+
+        Returns whether target is settled (True when running to completion).
+        """
+        settled = self.settled
+        if target in settled:
+            return True
+        distances, previous, queue = self.distances, self.previous, self.queue
+        pops = pushes = 0
+        while queue:
+            current_dist, current_node = heapq.heappop(queue)
+            pops += 1
+            if current_node in settled:
+                continue
+            settled.add(current_node)
+            # Relax before stopping, so the state stays resumable
+            for neighbor, weight in adjacency.get(current_node, {}).items():
+                distance = current_dist + weight
+                if distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = distance
+                    previous[neighbor] = current_node
+                    heapq.heappush(queue, (distance, neighbor))
+                    pushes += 1
+            if current_node == target:
+                break
+        tally('heap_pops', pops)
+        tally('heap_pushes', pushes)
+        return target is None or target in settled
+
+    def result(self, target):
+        """Return (length, path) to a settled target, or None"""
+        if target not in self.settled:
+            return None
+        return self.distances[target], walk_back(self.previous, target)
+
+
+def walk_back(previous, target):
+    """Reconstruct the path to target from a predecessor map"""
+    path = []
+    node = target
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    path.reverse()
+    return path
+
+
+class PathCache:
+    """Shortest-path results per source word, valid for one graph version
+
+    The first query from a source is answered by the graph's bidirectional
+    search and only its result is kept; asking again for the same pair is
+    a hit. A second target from the same source starts a SourceSearch,
+    which is kept and resumed by every later query from that source, so
+    targets it has already settled are hits and the others continue where
+    the last search stopped ("resumes"). That second query is a full
+    forward search from the source: the bidirectional search prunes words
+    off the shortest paths to its own target without relaxing their
+    edges, so its state cannot be resumed, and keeping a copy would slow
+    down every one-off query. Entries are kept in LRU order; at most
+    max_sources of them, and searches holding at most max_words reached
+    words in total (roughly 150 bytes each, so about 40 MiB by default).
+    The cache is dropped when the graph's version changes.
+    """
+
+    def __init__(self, graph, max_sources=256, max_words=1 << 18):
+        self._graph = graph
+        self.max_sources = max_sources
+        self.max_words = max_words
+        # source -> SourceSearch, or (target, result) of a single query
+        self._entries = OrderedDict()
+        self._words = 0
+        self._version = graph.version
+        self.hits = 0
+        self.misses = 0
+        self.resumes = 0
+        self.evictions = 0
+
+    def clear(self):
+        self._entries.clear()
+        self._words = 0
+        self._version = self._graph.version
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, source):
+        return source in self._entries
+
+    def stats(self):
+        """Return the hit, miss, resume and eviction counts and the size"""
+        return {'hits': self.hits, 'misses': self.misses,
+                'resumes': self.resumes, 'evictions': self.evictions,
+                'sources': len(self._entries), 'words': self._words}
+
+    def _entry(self, source):
+        if self._version != self._graph.version:
+            self.clear()
+        entry = self._entries.get(source)
+        if entry is not None:
+            self._entries.move_to_end(source)
+        return entry
+
+    def find(self, source, target):
+        """Return (length, path) of the shortest source -> target path, or None"""
+        entry = self._entry(source)
+        if isinstance(entry, SourceSearch):
+            if target in entry.settled:
+                self.hits += 1
+            elif entry.complete:
+                # Target is unreachable; known without searching
+                self.hits += 1
+                return None
+            else:
+                self.resumes += 1
+                before = len(entry)
+                entry.settle(self._graph.graph, target)
+                self._grow(len(entry) - before)
+            return entry.result(target)
+
+        if entry is not None and entry[0] == target:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        if entry is None:
+            found = self._graph._bidirectional_path(source, target)
+            self._store(source, (target, found), 0)
+            return found
+        # A second target: from now on, search from source once for all
+        search = SourceSearch(source)
+        search.settle(self._graph.graph, target)
+        self._store(source, search, len(search))
+        return search.result(target)
+
+    def search(self, source):
+        """Return the SourceSearch from source, run to completion"""
+        entry = self._entry(source)
+        if isinstance(entry, SourceSearch):
+            if entry.complete:
+                self.hits += 1
+            else:
+                self.resumes += 1
+                before = len(entry)
+                entry.settle(self._graph.graph)
+                self._grow(len(entry) - before)
+            return entry
+        self.misses += 1
+        search = SourceSearch(source)
+        search.settle(self._graph.graph)
+        self._store(source, search, len(search))
+        return search
+
+    def _store(self, source, entry, words):
+        old = self._entries.get(source)
+        if isinstance(old, SourceSearch):
+            self._words -= len(old)
+        self._entries[source] = entry
+        self._grow(words)
+
+    def _grow(self, words):
+        self._words += words
+        # Evict least recently used entries, but never the newest one
+        while len(self._entries) > 1 and (
+                len(self._entries) > self.max_sources or
+                self._words > self.max_words):
+            _, entry = self._entries.popitem(last=False)
+            if isinstance(entry, SourceSearch):
+                self._words -= len(entry)
+            self.evictions += 1
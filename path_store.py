@@ -0,0 +1,146 @@
+"""Multi-source shortest-path precomputation with a queryable result store
+
+Single-source Dijkstra runs over the CSR arrays of a CompactGraph, one
+source per task, spread across worker processes. Each result is kept as
+two arrays indexed by node id: the distance from the source and the
+predecessor on the shortest path. Any later path query from a stored source
+is a walk along the predecessor array, with no search.
+
+Node ids follow word order, so breaking heap ties on ids picks the same
+predecessors as TextGraph's string-keyed Dijkstra.
+"""
+import heapq
+import os
+from array import array
+
+from workers import process_pool
+
+UNREACHABLE = 0xFFFFFFFF
+NO_PREDECESSOR = -1
+
+# CSR arrays of the graph being searched, set once per worker process
+_csr = None
+
+
+def _as_array(typecode, values):
+    """Copy a memoryview (e.g. from a snapshot) into a picklable array"""
+    if isinstance(values, array):
+        return values
+    result = array(typecode)
+    result.frombytes(values)
+    return result
+
+
+def _init_worker(offsets, targets, weights):
+    global _csr
+    _csr = (offsets, targets, weights)
+
+
+def single_source(source, offsets, targets, weights):
+    """Run Dijkstra from node id source over CSR arrays
+
+    Returns ``(distances, predecessors)`` as ``array('I')`` and
+    ``array('i')`` indexed by node id; unreachable nodes have distance
+    UNREACHABLE and predecessor NO_PREDECESSOR.
+    """
+    n = len(offsets) - 1
+    distances = array('I', [UNREACHABLE]) * n
+    predecessors = array('i', [NO_PREDECESSOR]) * n
+    visited = bytearray(n)
+    distances[source] = 0
+    queue = [(0, source)]
+    while queue:
+        current_dist, current = heapq.heappop(queue)
+        if visited[current]:
+            continue
+        visited[current] = 1
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[k]
+            distance = current_dist + weights[k]
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                predecessors[neighbor] = current
+                heapq.heappush(queue, (distance, neighbor))
+    return distances, predecessors
+
+
+def _run_sources(sources):
+    return [(source,) + single_source(source, *_csr) for source in sources]
+
+
+class ShortestPathStore:
+    """Distance and predecessor arrays for a set of source nodes"""
+
+    def __init__(self, compact, version=None):
+        self.compact = compact
+        self.version = version
+        self.distances = {}
+        self.predecessors = {}
+
+    @classmethod
+    def build(cls, compact, sources=None, processes=None, version=None):
+        """Run single-source Dijkstra from every source (default: all nodes)
+
+        Memory is two 4-byte entries per (source, node) pair, so choose the
+        sources accordingly on large vocabularies.
+        """
+        store = cls(compact, version)
+        ids = compact.ids
+        if sources is None:
+            source_ids = list(range(len(compact.words)))
+        else:
+            source_ids = sorted({ids[word] for word in sources if word in ids})
+        csr = (_as_array('I', compact.offsets),
+               _as_array('I', compact.targets),
+               _as_array('I', compact.weights))
+
+        processes = processes or os.cpu_count() or 1
+        if processes == 1 or len(source_ids) <= 1:
+            for source in source_ids:
+                store._add(source, *single_source(source, *csr))
+            return store
+
+        # Ship the CSR arrays to each worker once, then hand out sources in
+        # batches to keep the per-task overhead low
+        step = max(1, len(source_ids) // (processes * 8))
+        batches = [source_ids[i:i + step]
+                   for i in range(0, len(source_ids), step)]
+        with process_pool(processes, initializer=_init_worker,
+                          initargs=csr) as executor:
+            for results in executor.map(_run_sources, batches):
+                for source, distances, predecessors in results:
+                    store._add(source, distances, predecessors)
+        return store
+
+    def _add(self, source, distances, predecessors):
+        self.distances[source] = distances
+        self.predecessors[source] = predecessors
+
+    def __contains__(self, word):
+        source = self.compact.ids.get(word)
+        return source is not None and source in self.distances
+
+    def __len__(self):
+        return len(self.distances)
+
+    def distance(self, word1, word2):
+        """Return the shortest distance from word1 to word2, or None"""
+        ids = self.compact.ids
+        distance = self.distances[ids[word1]][ids[word2]]
+        return None if distance == UNREACHABLE else distance
+
+    def path(self, word1, word2):
+        """Return (length, path) from a stored source word1 to word2, or None"""
+        ids, words = self.compact.ids, self.compact.words
+        source, target = ids[word1], ids[word2]
+        distance = self.distances[source][target]
+        if distance == UNREACHABLE:
+            return None
+        predecessors = self.predecessors[source]
+        path = []
+        node = target
+        while node != NO_PREDECESSOR:
+            path.append(words[node])
+            node = predecessors[node]
+        path.reverse()
+        return distance, path
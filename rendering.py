@@ -0,0 +1,200 @@
+"""Filtered, bounded-cost drawing of a TextGraph
+
+Drawing a whole novel's vocabulary gives an unreadable image and a spring
+layout that is quadratic in the number of nodes per iteration. Instead a
+subgraph is selected first -- the neighbourhood of a word, the top nodes
+by PageRank or degree, edges above a weight threshold -- and capped at
+max_nodes nodes and max_edges edges, so the layout and drawing costs are
+bounded whatever the size of the graph.
+Layouts are cached by subgraph content, so re-rendering the same view
+(or the same view after unrelated edits) skips the layout step.
+"""
+import heapq
+from collections import OrderedDict
+
+from results import WordNotFoundError
+
+BY_PAGERANK = 'pagerank'
+BY_DEGREE = 'degree'
+
+
+def neighbourhood(graph, word, hops=1):
+    """Return the words within hops edges of word, in either direction"""
+    seen = {word}
+    frontier = [word]
+    for _ in range(hops):
+        following = []
+        for current in frontier:
+            for adjacency in (graph.graph, graph.predecessors):
+                for neighbor in adjacency.get(current, ()):
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        following.append(neighbor)
+        if not following:
+            break
+        frontier = following
+    return seen
+
+
+def top_nodes(graph, count, by=BY_PAGERANK, candidates=None):
+    """Return the count best words of candidates (default: all), best first
+
+    Ties are broken alphabetically, so the selection is reproducible.
+    """
+    if by == BY_PAGERANK:
+        if candidates is None:
+            return [word for word, _ in graph.top_pagerank(count)]
+        # top_pagerank refreshes stale scores before answering
+        graph.top_pagerank(0)
+        scores = graph.pagerank
+        key = lambda word: (-scores.get(word, 0.0), word)  # noqa: E731
+    elif by == BY_DEGREE:
+        out_weight, in_weight = graph.out_weight, graph.in_weight
+        key = lambda word: (  # noqa: E731
+            -(out_weight.get(word, 0) + in_weight.get(word, 0)), word)
+    else:
+        raise ValueError(
+            f"Unknown ranking '{by}' (expected '{BY_PAGERANK}' or "
+            f"'{BY_DEGREE}').")
+    return heapq.nsmallest(count, graph.nodes if candidates is None
+                           else candidates, key=key)
+
+
+def select_subgraph(graph, top=None, by=BY_PAGERANK, around=None, hops=1,
+                    min_weight=None, max_nodes=200, max_edges=500):
+    """Pick the nodes and edges to draw
+
+    Returns ``(nodes, edges)`` with nodes sorted and edges as sorted
+    ``(source, target, weight)`` triples. around restricts the graph to a
+    neighbourhood, min_weight drops lighter edges (and the nodes left
+    without any), and top -- never more than max_nodes -- keeps the best
+    nodes by the by ranking. Of the edges among them only the max_edges
+    heaviest are kept, since drawing each edge is what makes a dense
+    image slow.
+    """
+    candidates = None
+    if around is not None:
+        if around not in graph.nodes:
+            raise WordNotFoundError(around)
+        candidates = neighbourhood(graph, around, hops)
+    if min_weight is not None:
+        sources = graph.graph if candidates is None else \
+            [word for word in candidates if word in graph.graph]
+        kept = set()
+        for source in sources:
+            for target, weight in graph.graph[source].items():
+                if weight >= min_weight and \
+                        (candidates is None or target in candidates):
+                    kept.add(source)
+                    kept.add(target)
+        if around is not None:
+            kept.add(around)
+        candidates = kept
+
+    limit = max_nodes if top is None else min(top, max_nodes)
+    size = len(graph.nodes) if candidates is None else len(candidates)
+    if size > limit:
+        chosen = top_nodes(graph, limit, by, candidates)
+        if around is not None and around not in chosen:
+            chosen[-1:] = [around]
+        candidates = set(chosen)
+    elif candidates is None:
+        candidates = set(graph.nodes)
+
+    edges = []
+    for source in candidates:
+        for target, weight in graph.graph.get(source, {}).items():
+            if target in candidates and \
+                    (min_weight is None or weight >= min_weight):
+                edges.append((source, target, weight))
+    if len(edges) > max_edges:
+        edges = heapq.nsmallest(max_edges, edges,
+                                key=lambda edge: (-edge[2], edge))
+    edges.sort()
+    return sorted(candidates), edges
+
+
+class LayoutCache:
+    """LRU cache of node positions keyed by the drawn subgraph
+
+    The key is the subgraph's content rather than the graph's version, so a
+    view whose nodes and edges did not change keeps its layout across edits
+    elsewhere in the graph.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._layouts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self._layouts.clear()
+
+    def __len__(self):
+        return len(self._layouts)
+
+    def layout(self, nodes, edges, iterations=50, seed=0):
+        """Return ``{word: (x, y)}`` for the subgraph, computing it once"""
+        key = (tuple(nodes), tuple(edges), iterations, seed)
+        positions = self._layouts.get(key)
+        if positions is not None:
+            self.hits += 1
+            self._layouts.move_to_end(key)
+            return positions
+        self.misses += 1
+        positions = compute_layout(nodes, edges, iterations, seed)
+        self._layouts[key] = positions
+        if len(self._layouts) > self.max_entries:
+            self._layouts.popitem(last=False)
+        return positions
+
+
+def _nx_graph(nodes, edges):
+    import networkx as nx
+
+    nx_graph = nx.DiGraph()
+    nx_graph.add_nodes_from(nodes)
+    nx_graph.add_weighted_edges_from(edges)
+    return nx_graph
+
+
+def compute_layout(nodes, edges, iterations=50, seed=0):
+    """Seeded spring layout with a fixed number of iterations"""
+    import networkx as nx
+
+    if not nodes:
+        return {}
+    positions = nx.spring_layout(_nx_graph(nodes, edges),
+                                 iterations=iterations, seed=seed)
+    return {word: (float(x), float(y)) for word, (x, y) in positions.items()}
+
+
+def render(nodes, edges, positions, path, title="Directed Graph Visualization"):
+    """Draw the subgraph with the given positions and save it to path
+
+    Node size and labels shrink as the subgraph grows; edge weights are
+    only labelled while they stay legible.
+    """
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
+    nx_graph = _nx_graph(nodes, edges)
+    count = max(1, len(nodes))
+    node_size = 2000 if count <= 20 else max(100, 40000 // count)
+    font_size = 10 if count <= 50 else 6
+
+    figure = plt.figure(figsize=(12, 8))
+    try:
+        nx.draw(nx_graph, positions, with_labels=True, node_size=node_size,
+                node_color='skyblue', font_size=font_size,
+                font_weight='bold', arrowsize=20 if count <= 50 else 8)
+        if len(edges) <= 100:
+            edge_labels = {(source, target): weight
+                           for source, target, weight in edges}
+            nx.draw_networkx_edge_labels(nx_graph, positions,
+                                         edge_labels=edge_labels)
+        plt.title(title)
+        plt.savefig(path)
+    finally:
+        plt.close(figure)
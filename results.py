@@ -0,0 +1,23 @@
+"""Result types returned by TextGraph's programmatic query API
+
+The calc_* / query_* methods format these into the familiar messages;
+callers that only need the data use the structured methods directly and
+skip the formatting.
+"""
+from typing import NamedTuple
+
+
+class WordNotFoundError(KeyError):
+    """A query named a word that is not in the graph"""
+
+    def __init__(self, word):
+        super().__init__(word)
+        self.word = word
+
+
+class PathResult(NamedTuple):
+    """A shortest path from source to target and its total weight"""
+    source: str
+    target: str
+    length: int
+    path: list
@@ -0,0 +1,43 @@
+"""Walker alias tables for O(1) weighted sampling of successor words"""
+
+
+class AliasTable:
+    """Draw one of ``items`` with probability proportional to ``weights``
+
+    Built once in O(d) with Vose's method; each draw then costs one random
+    number, independent of the number of items.
+    """
+
+    __slots__ = ('items', 'probability', 'alias')
+
+    def __init__(self, items, weights):
+        n = len(items)
+        if n == 0:
+            raise ValueError("Cannot sample from an empty distribution.")
+        total = sum(weights)
+        scaled = [weight * n / total for weight in weights]
+        probability = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1.0 up to rounding error
+        self.items = list(items)
+        self.probability = probability
+        self.alias = alias
+
+    def __len__(self):
+        return len(self.items)
+
+    def sample(self, rng):
+        """Return one item, drawing a single float from rng.random()"""
+        u = rng.random() * len(self.items)
+        i = int(u)
+        if u - i >= self.probability[i]:
+            i = self.alias[i]
+        return self.items[i]
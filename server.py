@@ -0,0 +1,293 @@
+"""Asyncio query server in front of a frozen TextGraph
+
+Clients connect over a Unix socket (or TCP on localhost, e.g. on Windows)
+and send one JSON object per line; each gets one JSON line back with the
+same "id". Requests on a connection are answered concurrently, so replies
+may come back out of order.
+
+    {"id": 1, "op": "bridge", "word1": "the", "word2": "of"}
+    {"id": 2, "op": "path", "word1": "the", "word2": "treasure"}
+    {"id": 3, "op": "pagerank", "word": "treasure"}
+    {"id": 4, "op": "pagerank", "top": 10}
+    {"id": 5, "op": "generate", "text": "seek out new life"}
+    {"id": 6, "op": "stats"}
+
+Replies are {"id": ..., "result": ...} or {"id": ..., "error": "..."}.
+
+Bridge-word, shortest-path and text-generation queries are CPU-bound and
+run in a process pool. Each worker rebuilds the graph once from
+TextGraph.shared_state(): a snapshot-backed graph is mapped from the same
+file in every worker, anything else is frozen and sent once per worker.
+PageRank is computed once up front and answered in the event loop.
+Deterministic queries that are already in flight are not sent again: a
+second client asking the same question awaits the first one's answer.
+
+Usage: python server.py CORPUS_OR_SNAPSHOT [--socket PATH | --port N]
+                        [--processes N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+
+from lab1 import TextGraph
+from results import WordNotFoundError
+from workers import graph_pool, worker_graph
+
+# Operations answered in the worker pool, with their parameters
+POOL_OPERATIONS = {
+    'bridge': ('word1', 'word2'),
+    'path': ('word1', 'word2'),
+    'generate': ('text',),
+}
+# Random output: identical requests must not share one answer
+UNCOALESCED = {'generate'}
+
+
+def string_field(request, name):
+    """Return request[name]; raises KeyError or ValueError unless a string"""
+    value = request[name]
+    if not isinstance(value, str):
+        raise ValueError(f"'{name}' must be a string")
+    return value
+
+
+def _run_query(op, args):
+    """Answer one pool query in a worker process"""
+    graph = worker_graph()
+    if op == 'bridge':
+        return list(graph.bridge_words(*args))
+    if op == 'path':
+        found = graph.shortest_path(*args)
+        if found is None:
+            return None
+        return {'length': found.length, 'path': found.path}
+    return graph.generate_new_text(*args)
+
+
+class QueryServer:
+    """Serves JSON-line queries against one graph with a worker pool"""
+
+    def __init__(self, graph, processes=None):
+        self.graph = graph.freeze()
+        self.processes = processes or os.cpu_count() or 1
+        self.stats = {'requests': 0, 'coalesced': 0, 'errors': 0}
+        self._in_flight = {}
+        self._executor = None
+        self._server = None
+
+    async def start(self, path=None, host='127.0.0.1', port=None):
+        """Start the pool and listen on a Unix socket path or a TCP port"""
+        from multiprocessing import get_context
+
+        if not self.graph.pagerank:
+            self.graph.compute_pagerank()
+        # Spawned rather than forked workers: a fork would inherit the
+        # client sockets accepted so far and keep those connections open
+        self._executor = graph_pool(self.graph, self.processes,
+                                    mp_context=get_context('spawn'))
+        if port is None:
+            self._server = await asyncio.start_unix_server(
+                self._handle_client, path=path)
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_client, host=host, port=port)
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    async def _handle_client(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def reply(line):
+            response = await self.answer_line(line)
+            async with lock:
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                task = asyncio.ensure_future(reply(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def answer_line(self, line):
+        """Answer one request line; always returns a response dict"""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            self.stats['errors'] += 1
+            return {'id': None, 'error': f"Invalid request: {e}"}
+        response = {'id': request.get('id')}
+        try:
+            response['result'] = await self.answer(request)
+        except WordNotFoundError as e:
+            self.stats['errors'] += 1
+            response['error'] = f"Word '{e.word}' not found in graph."
+            response['word'] = e.word
+        except (KeyError, TypeError, ValueError) as e:
+            self.stats['errors'] += 1
+            response['error'] = f"Invalid request: {e}"
+        return response
+
+    async def answer(self, request):
+        """Return the result of a request dict; raises on bad requests"""
+        self.stats['requests'] += 1
+        op = request.get('op')
+        if op == 'pagerank':
+            return self._pagerank(request)
+        if op == 'stats':
+            return dict(self.stats, in_flight=len(self._in_flight))
+        if op not in POOL_OPERATIONS:
+            raise ValueError(f"unknown operation '{op}'")
+
+        args = tuple(string_field(request, name)
+                     for name in POOL_OPERATIONS[op])
+        if op != 'generate':
+            args = tuple(arg.lower() for arg in args)
+        loop = asyncio.get_running_loop()
+        if op in UNCOALESCED:
+            return await loop.run_in_executor(
+                self._executor, _run_query, op, args)
+
+        key = (op, args)
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(future)
+        future = loop.run_in_executor(self._executor, _run_query, op, args)
+        self._in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def _pagerank(self, request):
+        graph = self.graph
+        if 'word' in request:
+            word = string_field(request, 'word').lower()
+            if word not in graph.pagerank:
+                raise WordNotFoundError(word)
+            return {'score': graph.pagerank[word],
+                    'rank': graph.pagerank_rank(word)}
+        return [[word, score] for word, score in
+                graph.top_pagerank(int(request.get('top', 10)))]
+
+
+class QueryClient:
+    """Minimal pipelining client: any number of queries in flight at once"""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._pending = {}
+        self._next_id = 0
+        self._listener = asyncio.ensure_future(self._listen())
+
+    @classmethod
+    async def connect(cls, path=None, host='127.0.0.1', port=None):
+        if port is None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _listen(self):
+        while line := await self._reader.readline():
+            response = json.loads(line)
+            future = self._pending.pop(response['id'], None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self._pending.values():
+            future.set_exception(ConnectionError("server closed"))
+
+    async def query(self, op, **params):
+        """Send one request and return the full response dict"""
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write((json.dumps(
+            dict(params, id=request_id, op=op)) + '\n').encode())
+        await self._writer.drain()
+        return await future
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._listener.cancel()
+
+
+def load_graph(path):
+    """Open a snapshot, or build a graph from a text file; None on error"""
+    try:
+        return TextGraph.load(path)
+    except (OSError, ValueError):
+        # Not a snapshot; build_graph reports a missing file itself
+        pass
+    graph = TextGraph()
+    return graph if graph.build_graph(path) else None
+
+
+async def serve(graph, path=None, port=None, processes=None):
+    server = QueryServer(graph, processes)
+    listener = await server.start(path=path, port=port)
+    where = path if port is None else f"127.0.0.1:{port}"
+    print(f"Serving {len(graph.nodes)} words on {where}", flush=True)
+    serving = asyncio.ensure_future(listener.serve_forever())
+    # Stop cleanly on SIGTERM too, so the worker processes are shut down
+    # with the server instead of being left behind
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, serving.cancel)
+    except (NotImplementedError, AttributeError):    # Windows
+        pass
+    try:
+        await serving
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("graph", help="text file or graph snapshot")
+    parser.add_argument("--socket", default="textgraph.sock",
+                        help="Unix socket path (default: textgraph.sock)")
+    parser.add_argument("--port", type=int,
+                        help="listen on 127.0.0.1:PORT instead of a socket")
+    parser.add_argument("--processes", type=int)
+    args = parser.parse_args(argv)
+
+    graph = load_graph(args.graph)
+    if graph is None:
+        return 1
+    if args.port is None and os.path.exists(args.socket):
+        os.unlink(args.socket)
+    try:
+        asyncio.run(serve(graph, args.socket, args.port, args.processes))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
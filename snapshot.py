@@ -0,0 +1,133 @@
+"""Versioned binary snapshot of a CompactGraph, loaded through mmap
+
+Layout (all sections start on an 8-byte boundary; the header is
+little-endian, the arrays use the native byte order recorded in flags):
+
+    header      MAGIC, version u32, flags u32, nodes u64, edges u64,
+                vocabulary bytes u64
+    vocabulary  UTF-8 words joined by '\\n', in id order
+    offsets     u32 * (nodes + 1)   forward CSR row offsets
+    targets     u32 * edges
+    weights     u32 * edges
+    in_offsets  u32 * (nodes + 1)   reverse CSR row offsets
+    sources     u32 * edges
+    in_weights  u32 * edges
+    out_totals  u64 * nodes
+    in_totals   u64 * nodes
+    pagerank    f64 * nodes         only if FLAG_PAGERANK is set
+    parameters  damping f64, iterations u64, tol f64 the scores were
+                computed with (NaN / 0 when unknown); with FLAG_PAGERANK,
+                from version 2 on
+
+Loading maps the file read-only and casts memoryviews over the sections,
+so the edge arrays are never copied and the pages are shared by every
+process that opens the same file.
+"""
+import math
+import mmap
+import struct
+import sys
+from array import array
+
+from compact_graph import CompactGraph
+
+MAGIC = b'TXTGRAPH'
+VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+FLAG_PAGERANK = 1
+FLAG_BIG_ENDIAN = 2
+_HEADER = struct.Struct('<8sIIQQQ')
+_PAGERANK_PARAMETERS = struct.Struct('<dQd')
+
+
+def _padding(size):
+    return -size % 8
+
+
+def _sections(compact):
+    """Return the array sections in file order"""
+    return [compact.offsets, compact.targets, compact.weights,
+            compact.in_offsets, compact.sources, compact.in_weights,
+            compact.out_totals, compact.in_totals]
+
+
+def save_snapshot(compact, path, pagerank=None, parameters=None):
+    """Write a CompactGraph (and optionally PageRank scores) to path
+
+    pagerank is a sequence of float scores in id order, or None;
+    parameters the ``(damping, iterations, tol)`` they were computed with,
+    any of which may be None.
+    """
+    vocabulary = '\n'.join(compact.words).encode('utf-8')
+    flags = FLAG_BIG_ENDIAN if sys.byteorder == 'big' else 0
+    if pagerank is not None:
+        flags |= FLAG_PAGERANK
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, flags, len(compact.words),
+                             compact.edge_count, len(vocabulary)))
+        f.write(vocabulary)
+        f.write(bytes(_padding(len(vocabulary))))
+        for section in _sections(compact):
+            data = memoryview(section).cast('B')
+            f.write(data)
+            f.write(bytes(_padding(len(data))))
+        if pagerank is not None:
+            f.write(array('d', pagerank))
+            damping, iterations, tol = parameters or (None, None, None)
+            f.write(_PAGERANK_PARAMETERS.pack(
+                math.nan if damping is None else damping,
+                iterations or 0,
+                math.nan if tol is None else tol))
+
+
+def load_snapshot(path):
+    """Map a snapshot file and return ``(compact, pagerank, parameters)``
+
+    pagerank is None if the file has no scores; parameters is the
+    ``(damping, iterations, tol)`` tuple given to save_snapshot, with None
+    for values that were not recorded.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < _HEADER.size:
+        raise ValueError(f"'{path}' is not a graph snapshot.")
+    magic, version, flags, nodes, edges, vocabulary_size = \
+        _HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        raise ValueError(f"'{path}' is not a graph snapshot.")
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(
+            f"Unsupported snapshot version {version} (expected {VERSION}).")
+    if bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == 'big'):
+        raise ValueError("Snapshot was written with a different byte order.")
+
+    view = memoryview(mapped)
+    position = _HEADER.size
+
+    def take(size, typecode):
+        nonlocal position
+        start = position
+        if start + size > len(view):
+            raise ValueError(f"Snapshot '{path}' is truncated.")
+        position += size + _padding(size)
+        return view[start:start + size].cast(typecode)
+
+    words = bytes(take(vocabulary_size, 'B')).decode('utf-8')
+    words = words.split('\n') if nodes else []
+    counts = [nodes + 1, edges, edges, nodes + 1, edges, edges, nodes, nodes]
+    # The memoryviews keep the mapping alive for as long as they are used
+    arrays = [take(count * struct.calcsize(typecode), typecode)
+              for count, typecode in zip(counts, 'IIIIIIQQ')]
+    compact = CompactGraph(words, *arrays)
+
+    pagerank = None
+    parameters = (None, None, None)
+    if flags & FLAG_PAGERANK:
+        pagerank = take(nodes * 8, 'd')
+        if version >= 2:
+            damping, iterations, tol = _PAGERANK_PARAMETERS.unpack(
+                take(_PAGERANK_PARAMETERS.size, 'B'))
+            parameters = (None if math.isnan(damping) else damping,
+                          iterations or None,
+                          None if math.isnan(tol) else tol)
+    return compact, pagerank, parameters
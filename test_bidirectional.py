@@ -0,0 +1,63 @@
+import heapq
+import random
+
+import pytest
+from lab1 import TextGraph
+
+
+def reference_path(graph, nodes, word1, word2):
+    """原始的单向 Dijkstra（提前终止）"""
+    distances = {node: float('inf') for node in nodes}
+    distances[word1] = 0
+    previous = {node: None for node in nodes}
+    visited = set()
+    queue = [(0, word1)]
+    while queue:
+        current_dist, current = heapq.heappop(queue)
+        if current in visited:
+            continue
+        visited.add(current)
+        if current == word2:
+            break
+        for neighbor, weight in graph.get(current, {}).items():
+            if current_dist + weight < distances[neighbor]:
+                distances[neighbor] = current_dist + weight
+                previous[neighbor] = current
+                heapq.heappush(queue, (current_dist + weight, neighbor))
+    if distances[word2] == float('inf'):
+        return None
+    path, node = [], word2
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return distances[word2], path[::-1]
+
+
+@pytest.fixture(scope="module")
+def novel_graph():
+    g = TextGraph()
+    g.build_graph("Cursed Be The Treasure.txt")
+    return g
+
+
+def test_matches_reference_on_novel(novel_graph):
+    """随机词对的路径与长度与原实现完全一致（含等长路径的选择）"""
+    rng = random.Random(2024)
+    words = sorted(novel_graph.nodes)
+    for _ in range(100):
+        word1, word2 = rng.choice(words), rng.choice(words)
+        expected = reference_path(novel_graph.graph, novel_graph.nodes, word1, word2)
+        assert novel_graph._bidirectional_path(word1, word2) == expected
+
+
+def test_matches_reference_on_frozen_graph(novel_graph):
+    """冻结图上结果一致"""
+    rng = random.Random(7)
+    words = sorted(novel_graph.nodes)
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(50)]
+    expected = [novel_graph._bidirectional_path(*pair) for pair in pairs]
+    frozen = TextGraph()
+    frozen.build_graph("Cursed Be The Treasure.txt")
+    frozen.freeze()
+    assert [frozen._bidirectional_path(*pair) for pair in pairs] == expected
+
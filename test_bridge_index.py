@@ -0,0 +1,78 @@
+import pytest
+from lab1 import TextGraph
+
+
+@pytest.fixture
+def built_graph():
+    g = TextGraph()
+    g.build_graph_from_text(
+        "To explore strange new worlds To seek out new life and new civilizations")
+    return g
+
+
+def test_messages_unchanged(built_graph):
+    """查询消息格式保持不变"""
+    assert built_graph.query_bridge_words("to", "strange") == \
+        "The bridge words from to to strange are: explore."
+    assert built_graph.query_bridge_words("life", "civilizations") == \
+        "No bridge words from life to civilizations!"
+    built_graph.build_graph_from_text("new a worlds new b worlds")
+    assert built_graph.query_bridge_words("new", "worlds") == \
+        "The bridge words from new to worlds are: a and b."
+
+
+def test_index_invalidated_on_change(built_graph):
+    """图变化后索引失效"""
+    assert built_graph.query_bridge_words("life", "civilizations") == \
+        "No bridge words from life to civilizations!"
+    built_graph.build_graph_from_text("life on civilizations")
+    assert built_graph.query_bridge_words("life", "civilizations") == \
+        "The bridge words from life to civilizations are: on."
+
+
+def test_lru_bound(built_graph):
+    """缓存的源词数量受限"""
+    built_graph.bridge_index.max_sources = 2
+    for word in ["to", "new", "out", "seek"]:
+        built_graph.bridge_index.row(word)
+    assert list(built_graph.bridge_index._rows) == ["out", "seek"]
+
+
+def test_batch_queries(built_graph):
+    """批量查询与单次查询一致"""
+    pairs = [("to", "strange"), ("NEW", "WORLDS"), ("seek", "new"),
+             ("galaxy", "life"), ("to", "out"), ("to", "strange")]
+    assert built_graph.query_bridge_words_batch(pairs) == [
+        ["explore"], [], ["out"], None, ["seek"], ["explore"]]
+
+
+def test_batch_on_frozen_graph(built_graph):
+    """冻结图上的批量查询"""
+    expected = built_graph.query_bridge_words_batch([("out", "life")])
+    assert built_graph.freeze().query_bridge_words_batch([("out", "life")]) == \
+        expected == [["new"]]
+
+
+def test_rows_built_only_for_hot_sources():
+    """冷查询直接探测，源词查询足够多后才建行"""
+    g = TextGraph()
+    g.build_graph_from_text("a b c a d c a e c b f b g b h d f d g e f e g")
+    index = g.bridge_index
+    assert g.bridge_words("a", "c") == ("b", "d", "e")
+    assert "a" not in index._rows
+    for _ in range(3):
+        assert g.bridge_words("a", "c") == ("b", "d", "e")
+    assert "a" in index._rows
+    assert index.lookup("galaxy", "c") == ()
+    assert index.lookup("a", "galaxy") == ()
+    assert "galaxy" not in index._rows and "galaxy" not in index._probed
+
+
+def test_entries_bound(built_graph):
+    """缓存的二跳目标总数受限"""
+    index = built_graph.bridge_index
+    index.max_entries = 3
+    index.row("to")
+    index.row("new")
+    assert list(index._rows) == ["new"]
+    assert index._entries == len(index._rows["new"])
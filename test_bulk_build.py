@@ -0,0 +1,66 @@
+import pytest
+from lab1 import TextGraph
+
+FILES = ["Easy Test.txt", "1.txt", "Cursed Be The Treasure.txt"]
+
+
+def sequential_graph(paths):
+    """参照：逐个文件调用 build_graph"""
+    g = TextGraph()
+    for path in paths:
+        assert g.build_graph(path)
+    return g
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_bulk_matches_sequential(processes):
+    """多进程建图与逐文件建图一致，边不跨文件"""
+    g = TextGraph()
+    assert g.build_graph_bulk(FILES, processes=processes)
+    expected = sequential_graph(FILES)
+    assert g.graph == expected.graph
+    assert g.nodes == expected.nodes
+    assert g.predecessors == expected.predecessors
+
+
+def test_join_files_links_boundaries():
+    """join_files=True 时文件首尾相连"""
+    texts = []
+    for path in FILES:
+        with open(path, 'r') as f:
+            texts.append(f.read())
+    expected = TextGraph()
+    expected.build_graph_from_text(" ".join(texts))
+
+    g = TextGraph()
+    assert g.build_graph_bulk(FILES, processes=2, join_files=True)
+    assert g.graph == expected.graph
+
+
+def test_glob_pattern(tmp_path):
+    """支持 glob 模式"""
+    (tmp_path / "a.txt").write_text("alpha beta")
+    (tmp_path / "b.txt").write_text("gamma delta")
+    (tmp_path / "skip.md").write_text("ignored words")
+    g = TextGraph()
+    assert g.build_graph_bulk(str(tmp_path / "*.txt"), processes=2)
+    assert g.graph == {"alpha": {"beta": 1}, "gamma": {"delta": 1}}
+
+
+def test_missing_file(capsys):
+    """文件不存在时返回 False"""
+    g = TextGraph()
+    assert not g.build_graph_bulk(["Easy Test.txt", "missing.txt"], processes=1)
+    assert "missing.txt" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_failed_bulk_build_leaves_graph_unchanged(processes, capsys):
+    """读取失败时图保持不变，可以再次建图"""
+    g = TextGraph()
+    g.build_graph_from_text("alpha beta")
+    before, version = dict(g.graph), g.version
+    assert not g.build_graph_bulk(FILES + ["missing.txt"], processes=processes)
+    assert "missing.txt" in capsys.readouterr().out
+    assert g.graph == before and g.version == version
+    assert g.predecessors == {"beta": {"alpha": 1}}
@@ -0,0 +1,134 @@
+import json
+
+from cli import main
+
+
+def run(capsys, *argv):
+    assert main(list(argv)) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_bridge_and_path_queries(tmp_path, capsys):
+    """查询文件逐行作答，错误行不影响其他行"""
+    queries = tmp_path / "queries.txt"
+    queries.write_text('the again\n\n{"id": 3, "word1": "the", "word2": "x"}\n'
+                       'not json {\n')
+    path, missing, unnamed = run(capsys, "path", "Easy Test.txt",
+                                 str(queries))
+    assert path["result"] == {"length": 5, "path": [
+        "the", "scientist", "analyzed", "it", "again"]}
+    assert missing == {"id": 3, "word1": "the", "word2": "x",
+                       "error": "Word 'x' not found in graph."}
+    assert "error" in unnamed
+
+    queries.write_text("the and\n")
+    (bridge,) = run(capsys, "bridge", "Easy Test.txt", str(queries))
+    assert bridge["result"] == ["report"]
+
+
+def test_snapshot_pagerank_and_walks(tmp_path, capsys):
+    """build 生成的快照可供后续子命令加载，随机游走可复现"""
+    snapshot = str(tmp_path / "graph.snap")
+    (built,) = run(capsys, "build", "Easy Test.txt", "-o", snapshot,
+                   "--pagerank")
+    assert built["nodes"] == 19
+    top = run(capsys, "pagerank", snapshot, "--top", "3")
+    assert [entry["result"]["rank"] for entry in top] == [1, 2, 3]
+    first = run(capsys, "walk", snapshot, "--count", "5", "--seed", "1")
+    assert run(capsys, "walk", snapshot, "--count", "5", "--seed", "1") == first
+    assert len(first) == 5
+
+
+def test_export_to_file(tmp_path, capsys):
+    """export 子命令写出边表"""
+    out = tmp_path / "edges.csv"
+    assert main(["export", "Easy Test.txt", "--format", "csv",
+                 "-o", str(out)]) == 0
+    lines = out.read_text().splitlines()
+    assert lines[0] == "source,target,weight" and len(lines) == 27
+
+
+def test_missing_graph(capsys):
+    """图文件不存在时返回非零"""
+    assert main(["bridge", "no such file.txt"]) == 1
+
+
+def test_generate_is_seedable(tmp_path, capsys):
+    """generate 按种子可复现，错误行保持原顺序"""
+    queries = tmp_path / "texts.txt"
+    queries.write_text("the scientist analyzed data\n{}\n"
+                       "the team requested data\n")
+    first = run(capsys, "generate", "Easy Test.txt", str(queries),
+                "--seed", "3")
+    assert run(capsys, "generate", "Easy Test.txt", str(queries),
+               "--seed", "3") == first
+    assert ["error" in answer for answer in first] == [False, True, False]
+    assert first[2]["result"] == "the team requested more data"
+
+
+def test_non_string_fields(tmp_path, capsys):
+    """JSON 字段不是字符串时只报告该行错误，前面的答案照常输出"""
+    queries = tmp_path / "queries.txt"
+    queries.write_text('the report\nthe again\n'
+                       '{"word1": null, "word2": "the"}\n'
+                       '{"word1": 1, "word2": "the"}\n')
+    for command in ("bridge", "path"):
+        answers = run(capsys, command, "Easy Test.txt", str(queries))
+        assert len(answers) == 4
+        assert "result" in answers[0] and "result" in answers[1]
+        assert answers[2]["error"] == \
+            "Invalid query: 'word1' must be a string"
+        assert answers[3]["error"] == \
+            "Invalid query: 'word1' must be a string"
+
+
+def test_walk_on_graph_without_edges(tmp_path, capsys):
+    """单词文件建图后 walk 报错退出而不是抛出异常"""
+    corpus = tmp_path / "one.txt"
+    corpus.write_text("word")
+    out = tmp_path / "walks.jsonl"
+    assert main(["walk", str(corpus), "--count", "2", "-o", str(out)]) == 1
+    assert "no edges" in capsys.readouterr().err
+    assert not out.exists()
+
+
+def test_build_from_single_glob(tmp_path, capsys):
+    """build 的单个 glob 参数先展开再建图"""
+    corpus = tmp_path / "corp"
+    corpus.mkdir()
+    (corpus / "one.txt").write_text("to seek out new life")
+    snapshot = str(tmp_path / "graph.snap")
+    (built,) = run(capsys, "build", str(corpus / "*.txt"), "-o", snapshot)
+    assert built["nodes"] == 5
+    (corpus / "two.txt").write_text("and new civilizations")
+    (built,) = run(capsys, "build", str(corpus / "*.txt"), "-o", snapshot,
+                   "--processes", "1")
+    assert built["nodes"] == 7
+
+
+def test_boolean_word_rejected(tmp_path, capsys):
+    """布尔值不会被当作单词 "true" 查询"""
+    queries = tmp_path / "queries.txt"
+    queries.write_text('{"word": true}\nthe\n')
+    boolean, word = run(capsys, "pagerank", "Easy Test.txt", str(queries))
+    assert boolean["error"] == "Invalid query: 'word' must be a string"
+    assert word["result"]["rank"] == 1
+
+
+def test_user_fields_not_echoed(tmp_path, capsys):
+    """只回显 id 和已知字段，用户的 "error"/"result" 字段不影响作答"""
+    queries = tmp_path / "queries.txt"
+    queries.write_text('{"text": "the report", "error": "x"}\n'
+                       '{"id": 1, "text": 5}\n'
+                       '{"id": 2, "text": "the data", "result": "y"}\n')
+    first, number, second = run(capsys, "generate", "Easy Test.txt",
+                                str(queries), "--seed", "1")
+    assert first == {"text": "the report", "result": "the report"}
+    assert number == {"id": 1, "text": 5,
+                      "error": "Invalid query: 'text' must be a string"}
+    assert second["id"] == 2 and second["result"].startswith("the")
+
+    queries.write_text('{"word1": "the", "word2": "x", "result": "y"}\n')
+    (bridge,) = run(capsys, "bridge", "Easy Test.txt", str(queries))
+    assert bridge == {"word1": "the", "word2": "x",
+                      "error": "Word 'x' not found in graph."}
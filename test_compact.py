@@ -0,0 +1,87 @@
+import random
+
+import pytest
+from lab1 import TextGraph
+from compact_graph import CompactGraph
+
+TEXT = "To explore strange new worlds To seek out new life and new civilizations"
+
+
+def make_graph(frozen=False):
+    g = TextGraph()
+    g.build_graph_from_text(TEXT)
+    g.build_graph_from_text("new worlds and new life to explore new life")
+    return g.freeze() if frozen else g
+
+
+@pytest.fixture
+def pair():
+    return make_graph(), make_graph(frozen=True)
+
+
+def test_views_match_dicts(pair):
+    """冻结后的视图与原字典内容一致"""
+    plain, frozen = pair
+    assert frozen.frozen and not plain.frozen
+    assert set(frozen.nodes) == plain.nodes
+    assert {k: dict(v) for k, v in frozen.graph.items()} == dict(plain.graph)
+    assert {k: dict(v) for k, v in frozen.predecessors.items()} == \
+        {k: v for k, v in plain.predecessors.items() if v}
+    for word in plain.nodes:
+        assert frozen.out_weight[word] == plain.out_weight.get(word, 0)
+        assert frozen.in_weight[word] == plain.in_weight.get(word, 0)
+    # 后继顺序保持插入顺序
+    assert list(frozen.graph["new"]) == list(plain.graph["new"])
+    assert "nowhere" not in frozen.graph
+    assert "civilizations" not in frozen.graph  # 无出边的词不是键
+
+
+def test_ids_follow_word_order():
+    """词 id 按字典序分配"""
+    compact = CompactGraph.from_dicts({"b", "a", "c"}, {"c": {"a": 1}})
+    assert compact.words == ["a", "b", "c"]
+    assert compact.ids["c"] == 2
+
+
+def test_queries_match(pair):
+    """冻结前后各查询结果一致"""
+    plain, frozen = pair
+    for w1, w2 in [("to", "strange"), ("new", "life"), ("life", "to"),
+                   ("galaxy", "to")]:
+        assert frozen.query_bridge_words(w1, w2) == plain.query_bridge_words(w1, w2)
+    for w1, w2 in [("to", "civilizations"), ("life", "worlds"), ("and", "and")]:
+        assert frozen.calc_shortest_path(w1, w2) == plain.calc_shortest_path(w1, w2)
+    assert sorted(frozen.calc_shortest_path("to").split("\n")) == \
+        sorted(plain.calc_shortest_path("to").split("\n"))
+    frozen.calc_pagerank()
+    plain.calc_pagerank()
+    for word, score in plain.pagerank.items():
+        assert frozen.pagerank[word] == pytest.approx(score, abs=1e-12)
+    assert frozen.calc_pagerank("new") == plain.calc_pagerank("new")
+
+    random.seed(7)
+    expected = plain.generate_new_text("seek new and explore worlds")
+    random.seed(7)
+    assert frozen.generate_new_text("seek new and explore worlds") == expected
+
+
+def test_random_walk_on_frozen(pair, tmp_path, monkeypatch):
+    """冻结图上随机游走仍沿合法边前进"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("lab1.time.sleep", lambda _: None)
+    _, frozen = pair
+    walk = frozen.random_walk().split()
+    for word1, word2 in zip(walk, walk[1:]):
+        assert word2 in frozen.graph[word1]
+
+
+def test_frozen_rejects_edits_and_thaws(pair):
+    """冻结图不可修改，thaw 后恢复可写"""
+    plain, frozen = pair
+    with pytest.raises(RuntimeError):
+        frozen.build_graph_from_text("one more")
+    frozen.thaw()
+    assert frozen.graph == plain.graph
+    assert frozen.build_graph_from_text("one more")
+    assert frozen.graph["one"] == {"more": 1}
+    assert frozen.in_weight["new"] == plain.in_weight["new"]
@@ -0,0 +1,62 @@
+import csv
+import io
+
+import pytest
+from lab1 import TextGraph
+
+
+@pytest.fixture
+def graph():
+    g = TextGraph()
+    g.build_graph_from_text("a b c a b d")
+    return g
+
+
+def test_text_matches_listing(graph, capsys):
+    """text 格式与 show_directed_graph 的逐行输出一致"""
+    out = io.StringIO()
+    assert graph.export_edges(out) == 4
+    assert out.getvalue() == ("a -> b [weight=2]\nb -> c [weight=1]\n"
+                              "b -> d [weight=1]\nc -> a [weight=1]\n")
+    graph.show_directed_graph()
+    assert out.getvalue() in capsys.readouterr().out
+
+
+def test_sort_and_limit(graph):
+    """按权重排序并限制条数"""
+    out = io.StringIO()
+    assert graph.export_edges(out, "tsv", sort_by_weight=True, limit=2) == 2
+    assert out.getvalue() == "source\ttarget\tweight\na\tb\t2\nb\tc\t1\n"
+
+
+def test_csv_roundtrip(tmp_path):
+    """CSV 输出可以被 csv 模块读回，必要时加引号"""
+    g = TextGraph()
+    g.merge_edges({"x,y": {'say "hi"': 3}})
+    path = tmp_path / "edges.csv"
+    g.export_edges(path, "csv", header=False)
+    with open(path, newline="") as f:
+        assert list(csv.reader(f)) == [["x,y", 'say "hi"', "3"]]
+
+
+def test_dot(graph):
+    """DOT 输出是合法的有向图描述"""
+    out = io.StringIO()
+    graph.export_edges(out, "dot", limit=1)
+    assert out.getvalue() == 'digraph G {\n  "a" -> "b" [weight=2];\n}\n'
+
+
+def test_large_export_in_blocks(tmp_path):
+    """大量边分块写出时不丢不重"""
+    g = TextGraph()
+    g.build_graph("Cursed Be The Treasure.txt")
+    edges = sum(len(row) for row in g.graph.values())
+    path = tmp_path / "edges.tsv"
+    assert g.export_edges(path, "tsv") == edges
+    assert path.read_text().count("\n") == edges + 1
+
+
+def test_unknown_format(graph):
+    """未知格式报错"""
+    with pytest.raises(ValueError):
+        graph.export_edges(io.StringIO(), "xml")
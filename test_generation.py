@@ -0,0 +1,63 @@
+import random
+
+import pytest
+from generation import iter_generate_document
+from lab1 import TextGraph
+
+
+@pytest.fixture(scope="module")
+def novel_graph():
+    g = TextGraph()
+    g.build_graph("Cursed Be The Treasure.txt")
+    return g
+
+
+@pytest.fixture(scope="module")
+def lines():
+    with open("Cursed Be The Treasure.txt") as f:
+        return [line for line in f if line.strip()][:200]
+
+
+def test_batch_matches_single_calls(novel_graph, lines):
+    """第 i 条文本的结果等于以 (seed, i) 为种子单独调用 generate_new_text"""
+    found = list(novel_graph.generate_new_texts(lines, seed=5, batch_size=16))
+    for i, line in enumerate(lines):
+        random.seed(f"5:{i}")
+        assert found[i] == novel_graph.generate_new_text(line)
+
+
+def test_seeded_output_independent_of_batching(novel_graph, lines):
+    """结果与批大小和进程数无关"""
+    expected = list(novel_graph.generate_new_texts(lines, seed=1))
+    assert list(novel_graph.generate_new_texts(
+        iter(lines), seed=1, batch_size=7)) == expected
+    assert list(novel_graph.generate_new_texts(
+        lines, seed=1, processes=2, batch_size=30)) == expected
+
+
+def test_empty_texts(novel_graph):
+    """空文本得到空字符串，与单次调用一致"""
+    assert list(novel_graph.generate_new_texts(["", "!!", "the"])) == \
+        ["", "", "the"]
+    assert list(novel_graph.generate_new_texts([])) == []
+
+
+def test_streamed_document(novel_graph, lines):
+    """分块流式处理整篇文档，与一次性调用结果相同"""
+    text = ''.join(lines)
+    random.seed(9)
+    expected = novel_graph.generate_new_text(text).split()
+    chunks = [text[i:i + 37] for i in range(0, len(text), 37)]
+    assert list(novel_graph.generate_document(chunks, seed=9)) == expected
+    assert list(iter_generate_document(
+        novel_graph, chunks, random.Random(9), batch_size=5)) == expected
+    assert list(novel_graph.generate_document([])) == []
+
+
+def test_unseeded_uses_random_module(novel_graph, lines):
+    """不给种子时与 generate_new_text 一样使用 random 模块的状态"""
+    random.seed(4)
+    expected = [novel_graph.generate_new_text(line) for line in lines]
+    random.seed(4)
+    assert list(novel_graph.generate_new_texts(lines, batch_size=16)) == \
+        expected
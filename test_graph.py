@@ -1,6 +1,8 @@
 import pytest
 from lab1 import TextGraph
 
+# 直接修改 graph / nodes 后需调用 rebuild_index()，使入边索引和缓存保持一致
+
 @pytest.fixture
 def test_graph():
     """使用提供的文本构建测试图"""
@@ -23,6 +25,7 @@ def test_path3_word2_none_no_reachable_nodes(test_graph):
     """路径3：word2=None，无可达节点（孤立节点测试）"""
     # 添加孤立节点
     test_graph.nodes.add("isolated")
+    test_graph.rebuild_index()
     result = test_graph.calc_shortest_path("isolated")
     assert result == "No paths found from isolated to other nodes."
 
@@ -66,6 +69,7 @@ def test_path9_unreachable(test_graph):
     """路径9：word2给定，不可达"""
     # 添加一个真正孤立的节点
     test_graph.nodes.add("isolated")
+    test_graph.rebuild_index()
     result = test_graph.calc_shortest_path("explore", "isolated")
     assert result == "No path exists from explore to isolated!"
 
@@ -73,6 +77,7 @@ def test_path10_visited_skip(test_graph):
     """路径10：节点已访问被跳过"""
     # 添加自环边触发visited检查
     test_graph.graph["new"]["new"] = 1
+    test_graph.rebuild_index()
     result = test_graph.calc_shortest_path("to", "civilizations")
     assert "new" in result  # 只要结果正常即可验证跳过逻辑
 
@@ -80,6 +85,7 @@ def test_path11_distance_update(test_graph):
     """路径11：发现更短距离"""
     # 添加更长路径
     test_graph.graph["explore"]["civilizations"] = 5  # 长路径
+    test_graph.rebuild_index()
     result = test_graph.calc_shortest_path("to", "civilizations")
     assert "to -> seek -> out -> new -> civilizations" in result  # 应选择更短路径
 
@@ -92,6 +98,7 @@ def test_path13_queue_empty(test_graph):
     """路径13：优先队列提前清空"""
     # 测试不可达情况
     test_graph.nodes.add("unconnected")
+    test_graph.rebuild_index()
     result = test_graph.calc_shortest_path("to", "unconnected")
     assert result == "No path exists from to to unconnected!"
 
@@ -99,6 +106,7 @@ def test_path14_early_termination(test_graph):
     """路径14：目标节点中途找到"""
     # 添加更远节点确保提前终止
     test_graph.graph["civilizations"]["distant"] = 1
+    test_graph.rebuild_index()
     result = test_graph.calc_shortest_path("to", "new")
     assert "distant" not in result  # 验证不会处理更远节点
 
@@ -112,6 +120,7 @@ def test_path16_complex_case(test_graph):
     # 添加交叉路径
     test_graph.graph["strange"]["life"] = 1
     test_graph.graph["life"]["strange"] = 1
+    test_graph.rebuild_index()
     result = test_graph.calc_shortest_path("to", "civilizations")
     # 验证能找到路径（可能有多条）
     assert "civilizations" in result
\ No newline at end of file
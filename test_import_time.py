@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "benchmarks"))
+
+from bench_import import import_times  # noqa: E402
+
+# Generous enough for a slow CI machine; importing matplotlib alone is
+# several times this
+BUDGET_MS = 250
+
+
+def test_heavy_modules_not_imported():
+    """导入 lab1 时不加载绘图库、NumPy 和键盘模块"""
+    code = ("import sys; from lab1 import TextGraph; "
+            "print(','.join(m for m in ('matplotlib', 'networkx', 'numpy', "
+            "'msvcrt', 'concurrent.futures') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_cold_start_budget():
+    """冷启动导入时间在预算之内"""
+    best = min(import_times()["lab1"] for _ in range(3)) / 1000
+    assert best < BUDGET_MS, f"import lab1 took {best:.0f} ms"
+
+
+def test_pagerank_still_works_after_lazy_import():
+    """延迟导入后 PageRank 仍可正常计算"""
+    pytest.importorskip("numpy")
+    from lab1 import TextGraph
+    g = TextGraph()
+    g.build_graph_from_text("a b c a")
+    assert g.calc_pagerank("a").startswith("PageRank")
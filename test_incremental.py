@@ -0,0 +1,82 @@
+import pytest
+from lab1 import TextGraph
+
+
+def fresh(*texts):
+    g = TextGraph()
+    for text in texts:
+        g.build_graph_from_text(text)
+    return g
+
+
+def state(g):
+    return (set(g.nodes), {k: dict(v) for k, v in g.graph.items()},
+            {k: dict(v) for k, v in g.predecessors.items()},
+            dict(g.out_weight), dict(g.in_weight))
+
+
+def test_remove_restores_previous_graph():
+    """删除文档后与从未添加过该文档的图一致"""
+    g = fresh("the cat sat on the mat")
+    g.add_document("the dog sat on a log")
+    g.remove_document("the dog sat on a log")
+    assert state(g) == state(fresh("the cat sat on the mat"))
+
+
+def test_remove_drops_isolated_nodes():
+    """度数降为零的节点被删除"""
+    g = fresh("a b c")
+    g.remove_document("b c")
+    assert set(g.nodes) == {"a", "b"}
+    assert "b" not in g.graph and "c" not in g.predecessors
+
+
+def test_remove_missing_bigram_is_atomic():
+    """文档中有图中不存在的二元组时报错且不修改图"""
+    g = fresh("a b c")
+    before, version = state(g), g.version
+    with pytest.raises(ValueError):
+        g.remove_document("a b b c")
+    assert state(g) == before and g.version == version
+
+
+def test_bridge_rows_invalidated_selectively():
+    """只丢弃受影响的桥接词索引行"""
+    g = fresh("x y z a b c")
+    assert g.bridge_words("x", "z") == ("y",)
+    assert g.bridge_words("a", "c") == ("b",)
+    g.add_document("x q z")
+    assert g.bridge_words("x", "z") == ("y", "q")
+    assert "a" in g.bridge_index._rows
+    g.remove_document("x y")
+    assert g.bridge_words("x", "z") == ("q",)
+
+
+def test_samplers_and_pagerank_follow_updates():
+    """更新后采样器和 PageRank 反映新的图"""
+    g = fresh("a b a c")
+    assert g.sample_successor("a") in ("b", "c")
+    g.remove_document("a c")
+    assert g.sample_successor("a") == "b"
+    assert g.sample_successor("c") is None
+    assert set(w for w, _ in g.top_pagerank(5)) == {"a", "b"}
+    g.add_document("b d")
+    assert g.walk_starts() == ["a", "b"]
+    assert g.pagerank_rank("d") is not None
+
+
+def test_frozen_graph_rejects_updates():
+    """冻结的图不允许增量更新"""
+    g = fresh("a b").freeze()
+    with pytest.raises(RuntimeError):
+        g.remove_document("a b")
+
+
+def test_path_store_dropped_on_update():
+    """增量更新后释放预计算的最短路径"""
+    g = fresh("a b c d")
+    g.precompute_shortest_paths(processes=1)
+    assert g.shortest_path("a", "d").length == 3
+    g.add_document("a d")
+    assert g.path_store is None
+    assert g.shortest_path("a", "d").path == ["a", "d"]
@@ -0,0 +1,74 @@
+import pytest
+from lab1 import TextGraph
+
+
+def assert_index_consistent(g):
+    """反向索引与正向图保持一致"""
+    expected = {}
+    for word1, successors in g.graph.items():
+        for word2, weight in successors.items():
+            expected.setdefault(word2, {})[word1] = weight
+    assert {k: v for k, v in g.predecessors.items() if v} == expected
+    for word in g.nodes:
+        assert g.out_weight.get(word, 0) == sum(g.graph.get(word, {}).values())
+        assert g.in_weight.get(word, 0) == sum(expected.get(word, {}).values())
+
+
+@pytest.fixture
+def built_graph():
+    g = TextGraph()
+    g.build_graph_from_text(
+        "To explore strange new worlds To seek out new life and new civilizations")
+    return g
+
+
+def test_index_after_text_build(built_graph):
+    """build_graph_from_text 维护反向索引"""
+    assert_index_consistent(built_graph)
+    assert built_graph.predecessors["new"] == {"strange": 1, "out": 1, "and": 1}
+    assert built_graph.in_weight["new"] == 3
+    assert built_graph.out_weight["new"] == 3
+
+
+def test_index_after_file_build():
+    """build_graph 维护反向索引"""
+    g = TextGraph()
+    assert g.build_graph("Easy Test.txt")
+    assert_index_consistent(g)
+
+
+def test_index_after_append(built_graph):
+    """追加文本后索引仍一致"""
+    built_graph.build_graph_from_text("new worlds and new life")
+    assert_index_consistent(built_graph)
+    assert built_graph.graph["new"]["worlds"] == 2
+
+
+def test_rebuild_index(built_graph):
+    """直接修改 graph 后 rebuild_index 恢复一致"""
+    built_graph.graph["life"]["strange"] = 2
+    built_graph.rebuild_index()
+    assert_index_consistent(built_graph)
+
+
+def test_assigning_graph_reindexes(built_graph):
+    """整体替换 graph 后索引、节点和缓存随之更新"""
+    built_graph.calc_pagerank()
+    built_graph.shortest_path("to", "new")
+    built_graph.graph = {"worlds": {"to": 1}, "to": {"new": 3}, "new": {}}
+    assert_index_consistent(built_graph)
+    assert built_graph.nodes == {"worlds", "to", "new"}
+    assert [word for word, _ in built_graph.top_pagerank(3)] == \
+        ["new", "to", "worlds"]
+    assert built_graph.calc_shortest_path("worlds", "new") == \
+        "Shortest path from worlds to new: worlds -> to -> new (length: 4)"
+    built_graph.nodes = built_graph.nodes | {"isolated"}
+    assert built_graph.pagerank_rank("isolated") == 4
+
+
+def test_bridge_words_order(built_graph):
+    """多个桥接词保持 out(word1) 的顺序"""
+    built_graph.build_graph_from_text("new a worlds new b worlds new c worlds")
+    assert built_graph._bridge_words("new", "worlds") == ("a", "b", "c")
+    result = built_graph.query_bridge_words("new", "worlds")
+    assert result == "The bridge words from new to worlds are: a, b and c."
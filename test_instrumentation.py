@@ -0,0 +1,96 @@
+import io
+import json
+import logging
+
+import pytest
+import instrumentation
+from instrumentation import (HistogramSink, JsonLinesSink, LoggingSink,
+                             instrument, tally, timer)
+from lab1 import TextGraph
+
+
+class ListSink:
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def graph():
+    g = TextGraph()
+    g.build_graph("Easy Test.txt")
+    return g
+
+
+def test_disabled_records_nothing(graph):
+    """未启用时不产生任何记录"""
+    assert not instrumentation.enabled()
+    assert timer("x").__enter__() is None
+    tally("ignored")
+    graph.calc_shortest_path("the", "again")
+
+
+def test_nested_spans_and_counters(graph):
+    """嵌套调用各自计时，计数器向外层累加"""
+    graph.path_cache.clear()    # 前面的查询结果已缓存，清空以重新搜索
+    sink = ListSink()
+    with instrument(sink):
+        graph.calc_shortest_path("the", "again")
+    assert not instrumentation.enabled()
+    inner, outer = sink.records
+    assert (inner.name, outer.name) == ("TextGraph.shortest_path",
+                                        "TextGraph.calc_shortest_path")
+    assert (inner.depth, outer.depth) == (1, 0)
+    assert inner.counters["heap_pops"] > 0
+    assert outer.counters == inner.counters
+    assert outer.seconds >= inner.seconds
+
+
+def test_build_and_pagerank_counters(graph):
+    """统计词数、PageRank 迭代次数和残差"""
+    sink = ListSink()
+    with instrument(sink):
+        graph.build_graph_from_text("one two three")
+        graph.compute_pagerank(tol=1e-6)
+    build, pagerank = sink.records[-2:]
+    assert build.counters == {"tokens": 3}
+    assert pagerank.counters["pagerank_iterations"] == \
+        graph.pagerank_iterations
+    assert pagerank.values["pagerank_residual"] == graph.pagerank_residual
+
+
+def test_walk_steps(graph):
+    """随机游走统计步数"""
+    sink = ListSink()
+    with instrument(sink):
+        graph.generate_walks(5, io.StringIO(), seed=1, processes=1)
+    record = sink.records[-1]
+    assert record.counters["walks"] == 5
+    assert record.counters["walk_steps"] >= 5
+
+
+def test_histogram_sink(graph):
+    """直方图汇总调用次数、分位数和计数器"""
+    sink = HistogramSink()
+    with instrument(sink):
+        for _ in range(10):
+            graph.query_bridge_words("the", "and")
+    stats = sink.summary()["TextGraph.query_bridge_words"]
+    assert stats["calls"] == 10
+    assert 0 < stats["p50"] <= stats["p99"] <= stats["max"]
+    assert stats["counters"]["bridge_rows_built"] == 1
+
+
+def test_json_lines_and_logging_sinks(graph, caplog):
+    """JSON 行和日志输出"""
+    out = io.StringIO()
+    with instrument(JsonLinesSink(out)):
+        graph.bridge_words("the", "and")
+    line = json.loads(out.getvalue())
+    assert line["name"] == "TextGraph.bridge_words"
+    with caplog.at_level(logging.INFO, logger="textgraph"):
+        with instrument(LoggingSink()):
+            graph.bridge_words("the", "and")
+    assert "TextGraph.bridge_words took" in caplog.text
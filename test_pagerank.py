@@ -0,0 +1,142 @@
+import pytest
+from lab1 import TextGraph
+
+TOLERANCE = 1e-12
+
+
+def reference_pagerank(graph, nodes, damping=0.85, iterations=100):
+    """原始的字典实现，作为数值对照"""
+    N = len(nodes)
+    pr = {node: 1 / N for node in nodes}
+    for _ in range(iterations):
+        dangling_pr = sum(pr[node] for node in nodes
+                          if node not in graph or not graph[node])
+        new_pr = {}
+        for node in nodes:
+            incoming_sum = 0
+            for incoming_node in [n for n in graph if node in graph[n]]:
+                outgoing_links = sum(graph[incoming_node].values())
+                incoming_sum += pr[incoming_node] * \
+                    (graph[incoming_node][node] / outgoing_links)
+            new_pr[node] = (1 - damping) / N + damping * \
+                (incoming_sum + dangling_pr / N)
+        pr = new_pr
+    return pr
+
+
+@pytest.fixture
+def built_graph():
+    g = TextGraph()
+    g.build_graph_from_text(
+        "To explore strange new worlds To seek out new life and new civilizations")
+    return g
+
+
+def test_matches_reference_small(built_graph):
+    """与原实现结果一致（小图）"""
+    built_graph.calc_pagerank()
+    expected = reference_pagerank(built_graph.graph, built_graph.nodes)
+    for node, score in expected.items():
+        assert built_graph.pagerank[node] == pytest.approx(score, abs=TOLERANCE)
+
+
+def test_matches_reference_easy_file():
+    """与原实现结果一致（Easy Test.txt）"""
+    g = TextGraph()
+    assert g.build_graph("Easy Test.txt")
+    g.calc_pagerank(damping=0.9, iterations=50)
+    expected = reference_pagerank(g.graph, g.nodes, damping=0.9, iterations=50)
+    for node, score in expected.items():
+        assert g.pagerank[node] == pytest.approx(score, abs=TOLERANCE)
+
+
+def test_scores_sum_to_one(built_graph):
+    """PageRank 总和为 1（含悬挂节点）"""
+    built_graph.calc_pagerank()
+    assert sum(built_graph.pagerank.values()) == pytest.approx(1.0)
+
+
+def test_word_query_format(built_graph):
+    """单词查询的输出格式不变"""
+    result = built_graph.calc_pagerank("NEW")
+    assert result.startswith("PageRank for 'new': ")
+    assert built_graph.calc_pagerank("galaxy") == "Word 'galaxy' not found in graph."
+
+
+def test_tolerance_stops_early():
+    """设置 tol 后提前收敛并记录迭代次数"""
+    g = TextGraph()
+    g.build_graph("Easy Test.txt")
+    g.calc_pagerank()
+    full = dict(g.pagerank)
+    assert g.pagerank_iterations == 100
+
+    g.calc_pagerank(tol=1e-10)
+    assert g.pagerank_iterations < 100
+    assert g.pagerank_residual < 1e-10
+    for node, score in full.items():
+        assert g.pagerank[node] == pytest.approx(score, abs=1e-9)
+
+
+def test_warm_start_after_append():
+    """追加文本后热启动比冷启动迭代更少"""
+    g = TextGraph()
+    g.build_graph("Cursed Be The Treasure.txt")
+    g.calc_pagerank(tol=1e-10)
+
+    g.build_graph_from_text("the treasure was found at last")
+    g.calc_pagerank(tol=1e-10, warm_start=True)
+    warm = dict(g.pagerank)
+    warm_iterations = g.pagerank_iterations
+
+    g.compute_pagerank(tol=1e-10)
+    assert warm_iterations < g.pagerank_iterations
+    for node, score in g.pagerank.items():
+        assert warm[node] == pytest.approx(score, abs=1e-9)
+
+
+def test_top_k_matches_full_sort():
+    """部分选择的 top-k 与完整排序一致（含并列）"""
+    g = TextGraph()
+    g.build_graph("Cursed Be The Treasure.txt")
+    g.compute_pagerank()
+    expected = sorted(g.pagerank.items(), key=lambda x: x[1], reverse=True)
+    for k in [1, 10, 250, len(expected) + 5]:
+        assert list(g.top_pagerank(k)) == expected[:k]
+
+
+def test_rank_lookup():
+    """单词排名查询与完整排序一致"""
+    g = TextGraph()
+    g.build_graph("Easy Test.txt")
+    g.compute_pagerank()
+    expected = sorted(g.pagerank.items(), key=lambda x: x[1], reverse=True)
+    for rank, (word, _) in enumerate(expected, 1):
+        assert g.pagerank_rank(word) == rank
+    assert g.pagerank_rank("Report") == g.pagerank_rank("report")
+    assert g.pagerank_rank("galaxy") is None
+
+
+def test_ranking_cached_until_change(built_graph, monkeypatch):
+    """图和阻尼系数不变时不重新计算"""
+    runs = []
+    original = built_graph.compute_pagerank
+
+    def counting(*args, **kwargs):
+        runs.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(built_graph, "compute_pagerank", counting)
+    built_graph.calc_pagerank()
+    built_graph.calc_pagerank("new")
+    list(built_graph.top_pagerank(5))
+    built_graph.pagerank_rank("new")
+    assert len(runs) == 1
+
+    built_graph.calc_pagerank(damping=0.5)
+    assert len(runs) == 2
+
+    built_graph.build_graph_from_text("worlds and more worlds")
+    assert built_graph.pagerank_rank("worlds") is not None
+    assert len(runs) == 3
+    assert "more" in built_graph.pagerank
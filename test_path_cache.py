@@ -0,0 +1,82 @@
+import random
+
+import pytest
+from lab1 import TextGraph
+from path_cache import PathCache
+from test_bidirectional import reference_path
+
+
+@pytest.fixture(scope="module")
+def novel_graph():
+    g = TextGraph()
+    g.build_graph("Cursed Be The Treasure.txt")
+    return g
+
+
+def test_cached_paths_match_reference(novel_graph):
+    """命中、续算和新搜索的结果都与原始 Dijkstra 一致"""
+    novel_graph.path_cache.clear()
+    rng = random.Random(11)
+    words = sorted(novel_graph.nodes)
+    sources = [rng.choice(words) for _ in range(5)]
+    for _ in range(3):
+        for _ in range(40):
+            word1, word2 = rng.choice(sources), rng.choice(words)
+            expected = reference_path(novel_graph.graph, novel_graph.nodes,
+                                      word1, word2)
+            found = novel_graph.shortest_path(word1, word2)
+            assert (found and (found.length, found.path)) == \
+                (expected and (expected[0], expected[1]))
+    stats = novel_graph.path_cache.stats()
+    assert stats["hits"] > 0 and stats["resumes"] > 0
+    assert stats["misses"] <= 2 * len(set(sources))
+
+
+def test_repeated_pair_is_a_hit():
+    """同一词对第二次查询直接命中"""
+    g = TextGraph()
+    g.build_graph("Easy Test.txt")
+    g.shortest_path("the", "report")
+    g.shortest_path("the", "report")
+    assert (g.path_cache.hits, g.path_cache.misses) == (1, 1)
+
+
+def test_shortest_paths_reuses_the_search():
+    """单源全部路径的搜索结果被后续单对查询复用"""
+    g = TextGraph()
+    g.build_graph("Easy Test.txt")
+    paths = {p.target: (p.length, p.path) for p in g.shortest_paths("the")}
+    for target, expected in paths.items():
+        found = g.shortest_path("the", target)
+        assert (found.length, found.path) == expected
+    assert g.path_cache.misses == 1
+    assert g.path_cache.hits == len(paths)
+
+
+def test_cache_dropped_on_graph_change():
+    """图变化后旧结果失效"""
+    g = TextGraph()
+    g.build_graph_from_text("a b c d")
+    assert g.shortest_path("a", "d").length == 3
+    g.add_document("a d")
+    assert g.shortest_path("a", "d").path == ["a", "d"]
+    assert g.path_cache.misses == 2
+
+
+def test_lru_and_size_eviction():
+    """按源数量和已到达词数淘汰最久未用的条目"""
+    g = TextGraph()
+    g.build_graph_from_text("a b c d e f a")
+    cache = g.path_cache = PathCache(g, max_sources=2)
+    for word in "abc":
+        cache.search(word)
+    assert "a" not in cache and len(cache) == 2
+    cache.find("b", "a")
+    cache.search("d")
+    assert "b" in cache and "c" not in cache
+    assert cache.evictions == 2
+
+    cache = PathCache(g, max_words=8)
+    cache.search("a")
+    cache.search("b")
+    assert len(cache) == 1 and cache.stats()["words"] == 6
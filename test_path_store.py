@@ -0,0 +1,53 @@
+import pytest
+from lab1 import TextGraph
+
+
+def fresh_copy():
+    g = TextGraph()
+    g.build_graph("Easy Test.txt")
+    g.build_graph_from_text(
+        "To explore strange new worlds To seek out new life and new civilizations")
+    return g
+
+
+@pytest.fixture
+def built_graph():
+    return fresh_copy()
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_store_matches_search(built_graph, processes):
+    """预计算结果与在线搜索完全一致"""
+    expected = fresh_copy()
+    store = built_graph.precompute_shortest_paths(processes=processes)
+    assert len(store) == len(built_graph.nodes)
+    for word1 in sorted(built_graph.nodes):
+        assert built_graph.calc_shortest_path(word1) == \
+            expected.calc_shortest_path(word1)
+        for word2 in ["to", "civilizations", "report", "again", word1]:
+            assert built_graph.calc_shortest_path(word1, word2) == \
+                expected.calc_shortest_path(word1, word2)
+
+
+def test_selected_sources(built_graph):
+    """只为指定的源词预计算"""
+    store = built_graph.precompute_shortest_paths(["TO", "new"], processes=1)
+    assert "to" in store and "new" in store and "seek" not in store
+    assert store.path("to", "civilizations") == (
+        4, ["to", "seek", "out", "new", "civilizations"])
+
+
+def test_store_ignored_after_change(built_graph):
+    """图变化后不再使用旧结果"""
+    built_graph.precompute_shortest_paths(["to"], processes=1)
+    built_graph.build_graph_from_text("to civilizations")
+    assert built_graph.calc_shortest_path("to", "civilizations") == \
+        "Shortest path from to to civilizations: to -> civilizations (length: 1)"
+
+
+def test_unreachable(built_graph):
+    """不可达目标"""
+    built_graph.precompute_shortest_paths(["civilizations"], processes=1)
+    assert built_graph.path_store.distance("civilizations", "to") is None
+    assert built_graph.calc_shortest_path("civilizations", "to") == \
+        "No path exists from civilizations to to!"
@@ -0,0 +1,76 @@
+import pytest
+from lab1 import TextGraph
+from rendering import LayoutCache, neighbourhood, select_subgraph
+from results import WordNotFoundError
+
+
+@pytest.fixture
+def graph():
+    g = TextGraph()
+    g.build_graph_from_text("a b c d a b e f a b c")
+    return g
+
+
+def test_neighbourhood_both_directions(graph):
+    """邻域同时沿出边和入边扩展"""
+    assert neighbourhood(graph, "c", 1) == {"b", "c", "d"}
+    assert neighbourhood(graph, "c", 2) == {"a", "b", "c", "d", "e"}
+
+
+def test_select_top_by_degree(graph):
+    """按度数选出前 N 个节点，只保留其间的边"""
+    nodes, edges = select_subgraph(graph, top=2, by="degree")
+    assert nodes == ["a", "b"]
+    assert edges == [("a", "b", 3)]
+
+
+def test_select_min_weight(graph):
+    """权重阈值过滤掉较轻的边和孤立节点"""
+    nodes, edges = select_subgraph(graph, min_weight=2)
+    assert nodes == ["a", "b", "c"]
+    assert edges == [("a", "b", 3), ("b", "c", 2)]
+
+
+def test_select_around_keeps_center(graph):
+    """以某词为中心时，即使排名靠后也保留该词"""
+    nodes, _ = select_subgraph(graph, top=2, by="degree", around="f", hops=2)
+    assert "f" in nodes and len(nodes) == 2
+    with pytest.raises(WordNotFoundError):
+        select_subgraph(graph, around="missing")
+
+
+def test_max_nodes_caps_selection(graph):
+    """max_nodes 限制节点数，top 不能超过它"""
+    nodes, _ = select_subgraph(graph, top=10, max_nodes=3)
+    assert len(nodes) == 3
+
+
+def test_layout_cache_hits():
+    """相同子图的布局只计算一次"""
+    pytest.importorskip("networkx")
+    cache = LayoutCache()
+    nodes, edges = ["a", "b"], [("a", "b", 1)]
+    first = cache.layout(nodes, edges)
+    assert cache.layout(nodes, edges) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert set(first) == {"a", "b"}
+
+
+def test_render_large_graph(tmp_path, capsys):
+    """大图只绘制受限的子图并生成图片"""
+    pytest.importorskip("matplotlib")
+    g = TextGraph()
+    g.build_graph("Cursed Be The Treasure.txt")
+    path = tmp_path / "graph.png"
+    g.show_directed_graph(save_to_file=True, top=40, path=str(path))
+    assert path.exists()
+    assert len(g.layout_cache) == 1
+    g.show_directed_graph(save_to_file=True, around="Treasure", path=str(path))
+    assert g.layout_cache.misses == 2
+    assert "saved" in capsys.readouterr().out
+
+
+def test_max_edges_keeps_heaviest(graph):
+    """边数超过上限时保留权重最大的边"""
+    _, edges = select_subgraph(graph, max_edges=2)
+    assert edges == [("a", "b", 3), ("b", "c", 2)]
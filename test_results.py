@@ -0,0 +1,58 @@
+import pytest
+from lab1 import TextGraph
+from results import PathResult, WordNotFoundError
+
+
+@pytest.fixture
+def built_graph():
+    g = TextGraph()
+    g.build_graph_from_text(
+        "To explore strange new worlds To seek out new life and new civilizations")
+    return g
+
+
+def test_shortest_path_result(built_graph):
+    """结构化最短路径结果"""
+    result = built_graph.shortest_path("To", "civilizations")
+    assert result == PathResult(
+        "to", "civilizations", 4, ["to", "seek", "out", "new", "civilizations"])
+    assert built_graph.shortest_path("civilizations", "to") is None
+
+
+def test_missing_word_raises(built_graph):
+    """缺失的词抛出 WordNotFoundError，并指明是哪个词"""
+    with pytest.raises(WordNotFoundError) as info:
+        built_graph.shortest_path("galaxy", "nebula")
+    assert info.value.word == "galaxy"
+    with pytest.raises(WordNotFoundError) as info:
+        built_graph.bridge_words("to", "nebula")
+    assert info.value.word == "nebula"
+    with pytest.raises(KeyError):
+        built_graph.shortest_paths("nebula")
+
+
+def test_shortest_paths_is_lazy_iterator(built_graph):
+    """单源结果是惰性迭代器，内容与字符串输出一致"""
+    paths = built_graph.shortest_paths("to")
+    assert iter(paths) is paths
+    results = {found.target: found for found in paths}
+    assert results["explore"].path == ["to", "explore"]
+    assert "to" not in results
+    lines = built_graph.calc_shortest_path("to").split("\n")
+    assert len(lines) == len(results)
+
+
+def test_bridge_words_tuple(built_graph):
+    """桥接词以元组返回"""
+    assert built_graph.bridge_words("TO", "strange") == ("explore",)
+    assert built_graph.bridge_words("life", "civilizations") == ()
+
+
+def test_pagerank_pairs(built_graph):
+    """PageRank 以 (word, score) 对返回"""
+    scores = built_graph.compute_pagerank()
+    top = list(built_graph.top_pagerank(3))
+    assert len(top) == 3
+    assert top[0][1] == max(scores.values())
+    assert [score for _, score in top] == sorted(
+        (score for _, score in top), reverse=True)
@@ -0,0 +1,47 @@
+import random
+from collections import Counter
+
+import pytest
+from lab1 import TextGraph
+from sampling import AliasTable
+
+
+def test_alias_distribution():
+    """别名表抽样频率与权重成正比"""
+    table = AliasTable(["a", "b", "c", "d"], [1, 2, 3, 4])
+    rng = random.Random(1)
+    counts = Counter(table.sample(rng) for _ in range(100000))
+    for item, weight in zip("abcd", [1, 2, 3, 4]):
+        assert counts[item] / 100000 == pytest.approx(weight / 10, abs=0.01)
+
+
+def test_single_item_and_empty():
+    """单元素与空分布"""
+    assert AliasTable(["only"], [5]).sample(random.Random(0)) == "only"
+    with pytest.raises(ValueError):
+        AliasTable([], [])
+
+
+def test_sample_successor_follows_edges():
+    """后继抽样只返回存在的边，并随图更新"""
+    g = TextGraph()
+    g.build_graph_from_text("the cat the dog the dog the end")
+    rng = random.Random(3)
+    counts = Counter(g.sample_successor("the", rng) for _ in range(20000))
+    assert set(counts) == {"cat", "dog", "end"}
+    assert counts["dog"] / 20000 == pytest.approx(0.5, abs=0.02)
+    assert g.sample_successor("end", rng) is None
+
+    g.build_graph_from_text("the bird")
+    seen = {g.sample_successor("the", rng) for _ in range(2000)}
+    assert "bird" in seen
+
+
+def test_sample_successor_on_frozen_graph():
+    """冻结图上同样可抽样"""
+    g = TextGraph()
+    g.build_graph("Easy Test.txt")
+    g.freeze()
+    rng = random.Random(5)
+    for _ in range(100):
+        assert g.sample_successor("the", rng) in g.graph["the"]
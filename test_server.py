@@ -0,0 +1,95 @@
+import asyncio
+import sys
+
+import pytest
+from lab1 import TextGraph
+from server import QueryClient, QueryServer
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32",
+                                reason="Unix sockets only")
+
+
+def run_with_server(tmp_path, body, processes=1):
+    graph = TextGraph()
+    graph.build_graph("Easy Test.txt")
+    path = str(tmp_path / "graph.sock")
+
+    async def scenario():
+        server = QueryServer(graph, processes=processes)
+        await server.start(path=path)
+        client = await QueryClient.connect(path)
+        try:
+            return await body(client, server)
+        finally:
+            await client.close()
+            await server.close()
+
+    return asyncio.run(scenario())
+
+
+def test_queries(tmp_path):
+    """各类查询返回结构化结果"""
+    async def body(client, server):
+        bridge = await client.query("bridge", word1="the", word2="and")
+        path = await client.query("path", word1="the", word2="again")
+        missing = await client.query("path", word1="the", word2="nowhere")
+        top = await client.query("pagerank", top=3)
+        score = await client.query("pagerank", word="the")
+        text = await client.query("generate", text="The scientist analyzed")
+        return bridge, path, missing, top, score, text
+
+    bridge, path, missing, top, score, text = run_with_server(tmp_path, body)
+    assert bridge["result"] == ["report"]
+    assert path["result"]["path"][0] == "the" and \
+        path["result"]["path"][-1] == "again"
+    assert missing["error"] == "Word 'nowhere' not found in graph."
+    assert len(top["result"]) == 3
+    assert score["result"]["rank"] >= 1
+    assert text["result"].startswith("the scientist")
+
+
+def test_matches_direct_calls(tmp_path):
+    """服务器结果与直接调用一致"""
+    graph = TextGraph()
+    graph.build_graph("Easy Test.txt")
+    expected = graph.shortest_path("the", "again")
+
+    async def body(client, server):
+        return await client.query("path", word1="THE", word2="again")
+
+    result = run_with_server(tmp_path, body)["result"]
+    assert (result["length"], result["path"]) == (expected.length,
+                                                  expected.path)
+
+
+def test_identical_queries_coalesced(tmp_path):
+    """同时到达的相同查询只计算一次"""
+    async def body(client, server):
+        replies = await asyncio.gather(*[
+            client.query("path", word1="the", word2="again")
+            for _ in range(20)])
+        stats = await client.query("stats")
+        return replies, stats["result"]
+
+    replies, stats = run_with_server(tmp_path, body)
+    assert len({str(reply["result"]) for reply in replies}) == 1
+    assert stats["coalesced"] > 0
+
+
+def test_bad_requests(tmp_path):
+    """无效请求返回错误而不中断连接"""
+    async def body(client, server):
+        unknown = await client.query("nope")
+        incomplete = await client.query("bridge", word1="the")
+        client._writer.write(b"not json\n")
+        null = await client.query("bridge", word1=None, word2="the")
+        boolean = await client.query("pagerank", word=True)
+        ok = await client.query("pagerank", word="the")
+        return unknown, incomplete, null, boolean, ok
+
+    unknown, incomplete, null, boolean, ok = run_with_server(tmp_path, body)
+    assert "unknown operation" in unknown["error"]
+    assert "Invalid request" in incomplete["error"]
+    assert null["error"] == "Invalid request: 'word1' must be a string"
+    assert boolean["error"] == "Invalid request: 'word' must be a string"
+    assert "result" in ok
@@ -0,0 +1,81 @@
+import pytest
+from lab1 import TextGraph
+
+
+@pytest.fixture
+def built_graph():
+    g = TextGraph()
+    g.build_graph("Easy Test.txt")
+    g.build_graph_from_text("the report and the team")
+    return g
+
+
+def test_roundtrip(built_graph, tmp_path):
+    """保存后加载得到相同的图"""
+    path = tmp_path / "graph.tgs"
+    built_graph.save(path)
+    loaded = TextGraph.load(path)
+    assert loaded.frozen
+    assert set(loaded.nodes) == built_graph.nodes
+    assert {k: dict(v) for k, v in loaded.graph.items()} == dict(built_graph.graph)
+    assert list(loaded.graph["the"]) == list(built_graph.graph["the"])
+    assert loaded.query_bridge_words("the", "report") == \
+        built_graph.query_bridge_words("the", "report")
+    assert loaded.calc_shortest_path("the", "again") == \
+        built_graph.calc_shortest_path("the", "again")
+
+
+def test_arrays_are_memory_mapped(built_graph, tmp_path):
+    """加载后的边数组是 mmap 上的 memoryview"""
+    path = tmp_path / "graph.tgs"
+    built_graph.save(path)
+    loaded = TextGraph.load(path)
+    assert isinstance(loaded.compact.targets, memoryview)
+    assert loaded.compact.targets.readonly
+
+
+def test_pagerank_is_stored(built_graph, tmp_path):
+    """可选保存 PageRank"""
+    built_graph.calc_pagerank()
+    built_graph.save(tmp_path / "with.tgs")
+    built_graph.save(tmp_path / "without.tgs", include_pagerank=False)
+
+    loaded = TextGraph.load(tmp_path / "with.tgs")
+    assert loaded.pagerank == pytest.approx(built_graph.pagerank)
+    assert TextGraph.load(tmp_path / "without.tgs").pagerank == {}
+
+    loaded.calc_pagerank()
+    assert loaded.pagerank == pytest.approx(built_graph.pagerank)
+
+
+def test_frozen_graph_saves(built_graph, tmp_path):
+    """冻结图同样可以保存"""
+    built_graph.freeze().save(tmp_path / "frozen.tgs")
+    loaded = TextGraph.load(tmp_path / "frozen.tgs")
+    assert dict(loaded.in_weight) == dict(built_graph.in_weight)
+
+
+def test_rejects_other_files(tmp_path):
+    """非快照文件报错"""
+    path = tmp_path / "bad.tgs"
+    path.write_bytes(b"not a snapshot at all, just some text")
+    with pytest.raises(ValueError):
+        TextGraph.load(path)
+
+
+def test_stale_pagerank_refreshed_before_saving(tmp_path):
+    """图更新后保存前先刷新 PageRank，并记录计算参数"""
+    graph = TextGraph()
+    graph.build_graph("Easy Test.txt")
+    graph.calc_pagerank(damping=0.9, iterations=50)
+    graph.add_document("zebra zebra zebra a")
+    graph.save(tmp_path / "graph.tgs")
+    loaded = TextGraph.load(tmp_path / "graph.tgs")
+    assert loaded.pagerank["zebra"] > 0
+    assert loaded._pagerank_key == (loaded.version, 0.9, 50, None)
+
+    fresh = TextGraph()
+    fresh.build_graph("Easy Test.txt")
+    fresh.add_document("zebra zebra zebra a")
+    fresh.calc_pagerank(damping=0.9, iterations=50)
+    assert loaded.pagerank == pytest.approx(fresh.pagerank, abs=1e-6)
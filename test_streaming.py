@@ -0,0 +1,59 @@
+import pytest
+from lab1 import TextGraph
+
+
+def whole_file_graph(path):
+    """参照：一次性读入整个文件建图"""
+    g = TextGraph()
+    with open(path, 'r') as f:
+        assert g.build_graph_from_text(f.read())
+    return g
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 4096])
+def test_chunked_build_matches_whole_file(chunk_size):
+    """任意分块大小建出的图与整体读入一致"""
+    expected = whole_file_graph("Easy Test.txt")
+    g = TextGraph()
+    assert g.build_graph("Easy Test.txt", chunk_size=chunk_size)
+    assert g.graph == expected.graph
+    assert g.nodes == expected.nodes
+
+
+def test_chunked_build_large_corpus():
+    """大语料分块建图一致"""
+    expected = whole_file_graph("Cursed Be The Treasure.txt")
+    g = TextGraph()
+    assert g.build_graph("Cursed Be The Treasure.txt", chunk_size=1000)
+    assert g.graph == expected.graph
+    assert g.in_weight == expected.in_weight
+
+
+def test_word_split_across_chunks(tmp_path):
+    """跨块边界的单词和边都被保留"""
+    path = tmp_path / "split.txt"
+    path.write_text("alpha beta, gamma")
+    g = TextGraph()
+    assert g.build_graph(str(path), chunk_size=3)
+    assert g.graph == {"alpha": {"beta": 1}, "beta": {"gamma": 1}}
+
+
+def test_empty_file(tmp_path, capsys):
+    """空文件仍返回 False"""
+    path = tmp_path / "empty.txt"
+    path.write_text(" ,,, 123 ")
+    g = TextGraph()
+    assert not g.build_graph(str(path), chunk_size=2)
+    assert "no valid words" in capsys.readouterr().out
+
+
+def test_read_error_leaves_graph_unchanged(tmp_path, capsys):
+    """读到中途出错时图保持不变"""
+    path = tmp_path / "broken.txt"
+    path.write_bytes(b"alpha beta " * 30000 + b"\xff\xfe gamma")
+    g = TextGraph()
+    g.build_graph_from_text("one two")
+    assert not g.build_graph(str(path), chunk_size=4096)
+    assert "Error reading file" in capsys.readouterr().out
+    assert g.graph == {"one": {"two": 1}} and g.nodes == {"one", "two"}
+    assert g.build_graph("Easy Test.txt")
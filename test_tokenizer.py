@@ -0,0 +1,38 @@
+import re
+
+import pytest
+from tokenizer import iter_chunked_tokens, iter_tokens, tokenize
+
+
+def regex_process_text(text):
+    """原始 process_text 的实现"""
+    return re.sub(r'[^a-zA-Z]', ' ', text).lower().split()
+
+
+SAMPLES = [
+    "",
+    "To @ explore strange new worlds,\nTo seek out new life and new civilizations?",
+    "Café naïve façade — ÜBER straße 123abc_DEF\tghi\x00jkl",
+    "emoji😀between words and\ud800surrogates",
+    "   leading and trailing   ",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_tokenize_matches_regex(text):
+    """列表接口与正则实现一致"""
+    assert tokenize(text) == regex_process_text(text)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_iter_tokens_matches_regex(text):
+    """惰性接口与正则实现一致（小块大小）"""
+    assert list(iter_tokens(text, block_size=3)) == regex_process_text(text)
+
+
+def test_chunked_tokens_on_corpus():
+    """分块迭代在完整语料上一致"""
+    with open("Cursed Be The Treasure.txt", 'r') as f:
+        text = f.read()
+    chunks = (text[i:i + 997] for i in range(0, len(text), 997))
+    assert list(iter_chunked_tokens(chunks)) == regex_process_text(text)
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+import walks
+from lab1 import TextGraph
+
+
+@pytest.fixture
+def built_graph():
+    g = TextGraph()
+    g.build_graph("Easy Test.txt")
+    return g
+
+
+def assert_valid_walk(g, path, max_length=None):
+    """每一步都沿已有的边，且不重复使用同一条边"""
+    edges = list(zip(path, path[1:]))
+    for word1, word2 in edges:
+        assert word2 in g.graph[word1]
+    assert len(edges) == len(set(edges))
+    if max_length is not None:
+        assert len(path) <= max_length
+
+
+def test_stop_reasons(built_graph):
+    """停止原因：死路、重复边、最大长度"""
+    g = TextGraph()
+    g.build_graph_from_text("a b c")
+    steps = walks.iter_walk(g, random.Random(0), start="a")
+    assert list(steps) == ["a", "b", "c"]
+
+    g = TextGraph()
+    g.build_graph_from_text("x y x")
+    steps = walks.iter_walk(g, random.Random(0), start="x")
+    words = [next(steps), next(steps), next(steps)]
+    with pytest.raises(StopIteration) as stop:
+        next(steps)
+    assert words == ["x", "y", "x"]
+    assert stop.value.value == (walks.REPEATED_EDGE, ("x", "y"))
+
+    assert len(walks.walk(built_graph, random.Random(1), max_length=3)) <= 3
+
+
+def test_seeded_walks_reproducible(built_graph):
+    """相同种子得到相同的游走"""
+    first = list(built_graph.iter_walks(50, seed=42))
+    second = list(built_graph.iter_walks(50, seed=42))
+    assert first == second
+    for path in first:
+        assert_valid_walk(built_graph, path)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_generate_walks_to_file(built_graph, tmp_path, processes):
+    """批量游走写入文件，且与进程数无关"""
+    out = tmp_path / "walks.txt"
+    written = built_graph.generate_walks(
+        25, out, seed=7, max_length=6, processes=processes, batch_size=4)
+    lines = out.read_text().splitlines()
+    assert written == len(lines) == 25
+    expected = [' '.join(path) for path in
+                walks.iter_walks(built_graph, 25, seed=7, max_length=6,
+                                 batch_size=4)]
+    assert lines == expected
+    for line in lines:
+        assert_valid_walk(built_graph, line.split(), max_length=6)
+
+
+def test_generate_walks_callback_from_snapshot(built_graph, tmp_path):
+    """快照加载的图可在多进程中游走，结果交给回调"""
+    built_graph.save(tmp_path / "g.tgs")
+    loaded = TextGraph.load(tmp_path / "g.tgs")
+    assert loaded.shared_state() == ('snapshot', str(tmp_path / "g.tgs"))
+    received = []
+    loaded.generate_walks(10, received.append, seed=1, processes=2,
+                          batch_size=3)
+    assert len(received) == 10
+
+
+def test_random_walk_headless(built_graph, tmp_path, monkeypatch):
+    """交互式随机游走在非 Windows 平台上也能运行"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("lab1.time.sleep", lambda _: None)
+    result = built_graph.random_walk()
+    assert_valid_walk(built_graph, result.split())
+    assert (tmp_path / "random_walk.txt").read_text() == result
+
+
+def test_walks_on_graph_without_edges(tmp_path):
+    """没有边的图上批量游走给出明确的 ValueError"""
+    g = TextGraph()
+    g.build_graph_from_text("a b")
+    g.remove_document("a b")
+    with pytest.raises(ValueError, match="no edges"):
+        g.iter_walks(3)
+    out = tmp_path / "walks.txt"
+    with pytest.raises(ValueError, match="no edges"):
+        g.generate_walks(3, out)
+    assert not out.exists()
+    assert list(g.iter_walks(0)) == []
@@ -0,0 +1,46 @@
+"""Precompiled tokenizer producing the same words as TextGraph.process_text
+
+process_text used to run ``re.sub(r'[^a-zA-Z]', ' ', text).lower()`` and
+split the result. Here the substitution and lowercasing are a single
+``bytes.translate`` pass over a 256-entry table, and the lazy variants
+translate one bounded block at a time.
+"""
+# ASCII letters map to their lowercase form, every other byte to a space.
+# Non-ASCII characters are first encoded as '?' and so become spaces too.
+_TABLE = bytes(
+    c + 32 if 65 <= c <= 90 else c if 97 <= c <= 122 else 32
+    for c in range(256))
+_LETTERS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+
+def tokenize(text):
+    """Return the lowercase ASCII words of text as a list"""
+    return text.encode('ascii', 'replace').translate(_TABLE).decode(
+        'ascii').split()
+
+
+def iter_tokens(text, block_size=1 << 16):
+    """Yield the lowercase ASCII words of text one at a time
+
+    The text is translated block_size characters at a time, so only one
+    block is ever copied instead of the whole text.
+    """
+    return iter_chunked_tokens(
+        text[i:i + block_size] for i in range(0, len(text), block_size))
+
+
+def iter_chunked_tokens(chunks):
+    """Yield the words of a text delivered as an iterable of string chunks
+
+    A word cut by a chunk boundary is held back and joined with the start
+    of the next chunk, so the output equals ``tokenize(''.join(chunks))``.
+    """
+    pending = ''
+    for chunk in chunks:
+        text = pending + chunk
+        cut = len(text)
+        while cut and text[cut - 1] in _LETTERS:
+            cut -= 1
+        pending = text[cut:]
+        yield from tokenize(text[:cut])
+    yield from tokenize(pending)
@@ -0,0 +1,145 @@
+"""Headless, seedable random walks over a TextGraph
+
+The walk rule is the one random_walk has always used: start at a random
+word with outgoing edges, follow edges with probability proportional to
+their weight, and stop at a dead end or just before an edge would be taken
+a second time. max_length additionally caps the number of words.
+
+Nothing here prints, sleeps or touches the keyboard, so walks can be
+generated in bulk, across processes, and streamed to a file or callback.
+"""
+import os
+import random
+
+from instrumentation import tally
+from workers import graph_pool, windowed_map, worker_graph
+
+DEAD_END = 'dead_end'
+REPEATED_EDGE = 'repeated_edge'
+MAX_LENGTH = 'max_length'
+
+
+def iter_walk(graph, rng=random, start=None, max_length=None):
+    """Yield the words of one random walk as it is taken
+
+    The generator's return value (StopIteration.value) is a
+    ``(reason, detail)`` pair: ``(DEAD_END, word)``,
+    ``(REPEATED_EDGE, (word1, word2))`` or ``(MAX_LENGTH, None)``.
+    rng needs random() and choice(), e.g. a random.Random instance.
+    """
+    current = start if start is not None else rng.choice(graph.walk_starts())
+    yield current
+    visited_edges = set()
+    length = 1
+    while max_length is None or length < max_length:
+        next_node = graph.sample_successor(current, rng)
+        if next_node is None:
+            return DEAD_END, current
+        edge = (current, next_node)
+        if edge in visited_edges:
+            return REPEATED_EDGE, edge
+        visited_edges.add(edge)
+        current = next_node
+        length += 1
+        yield current
+    return MAX_LENGTH, None
+
+
+def walk(graph, rng=random, start=None, max_length=None):
+    """Return one random walk as a list of words"""
+    words = list(iter_walk(graph, rng, start, max_length))
+    tally('walk_steps', len(words))
+    return words
+
+
+def batch_rng(seed, batch):
+    """Return the generator for one batch of walks
+
+    Each batch gets its own stream derived from (seed, batch), so the walks
+    produced do not depend on how batches are spread over processes.
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(f"{seed}:{batch}")
+
+
+def _check_starts(graph, count, start):
+    """Raise ValueError if walks are requested but none can start"""
+    if count > 0 and start is None and not graph.walk_starts():
+        raise ValueError("Graph has no edges; there is nothing to walk.")
+
+
+def iter_walks(graph, count, seed=None, max_length=None, start=None,
+               batch_size=1000):
+    """Yield count independent walks (lists of words), reproducibly if seeded
+
+    Raises ValueError at once if the graph has no edges and no start is
+    given.
+    """
+    _check_starts(graph, count, start)
+    return _iter_walks(graph, count, seed, max_length, start, batch_size)
+
+
+def _iter_walks(graph, count, seed, max_length, start, batch_size):
+    for batch, first in enumerate(range(0, count, batch_size)):
+        rng = batch_rng(seed, batch)
+        for _ in range(min(batch_size, count - first)):
+            yield walk(graph, rng, start, max_length)
+
+
+def _run_batch(batch, size, seed, max_length, start):
+    rng = batch_rng(seed, batch)
+    return [' '.join(walk(worker_graph(), rng, start, max_length))
+            for _ in range(size)]
+
+
+def _open_sink(out):
+    """Return (write_line, close) for a path, a file object or a callback"""
+    if isinstance(out, (str, os.PathLike)):
+        file = open(out, 'w')
+        return (lambda line: file.write(line + '\n')), file.close
+    if hasattr(out, 'write'):
+        return (lambda line: out.write(line + '\n')), (lambda: None)
+    return out, (lambda: None)
+
+
+def generate_walks(graph, count, out, seed=None, max_length=None, start=None,
+                   processes=None, batch_size=1000):
+    """Generate count walks and stream them to out; return the count written
+
+    out is a file path, a writable text file, or a callable that receives
+    each walk as a space-separated string. Batches of batch_size walks are
+    produced in a process pool (in-process when processes is 1); at most a
+    few batches per worker are in flight, so memory stays bounded however
+    many walks are requested. With a seed the output is identical for any
+    number of processes. Raises ValueError, before out is opened, if the
+    graph has no edges and no start is given.
+    """
+    _check_starts(graph, count, start)
+    write, close = _open_sink(out)
+    batches = [(batch, min(batch_size, count - first))
+               for batch, first in enumerate(range(0, count, batch_size))]
+    written = 0
+    try:
+        processes = processes or os.cpu_count() or 1
+        if processes == 1 or len(batches) <= 1:
+            for batch, size in batches:
+                rng = batch_rng(seed, batch)
+                for _ in range(size):
+                    write(' '.join(walk(graph, rng, start, max_length)))
+                    written += 1
+            tally('walks', written)
+            return written
+
+        with graph_pool(graph, processes) as executor:
+            tasks = ((batch, size, seed, max_length, start)
+                     for batch, size in batches)
+            for lines in windowed_map(executor, _run_batch, tasks,
+                                      window=processes * 2):
+                for line in lines:
+                    write(line)
+                    written += 1
+        tally('walks', written)
+        return written
+    finally:
+        close()
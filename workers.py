@@ -0,0 +1,50 @@
+"""Process pools for TextGraph work, with the graph shared by every worker
+
+graph_pool() starts workers that each rebuild the graph once from
+TextGraph.shared_state(); tasks running in them get it from
+worker_graph(). windowed_map() feeds such a pool from a long stream of
+tasks while keeping only a few of them in flight.
+"""
+from collections import deque
+
+# Graph rebuilt once per worker process by init_worker
+_worker_graph = None
+
+
+def init_worker(graph_class, state):
+    global _worker_graph
+    _worker_graph = graph_class.from_shared_state(state)
+
+
+def worker_graph():
+    """Return the graph of the current worker process"""
+    return _worker_graph
+
+
+def process_pool(processes, **kwargs):
+    """Return a ProcessPoolExecutor; kwargs are passed through"""
+    # Imported on first use to keep `import lab1` cheap
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=processes, **kwargs)
+
+
+def graph_pool(graph, processes, mp_context=None):
+    """Return a pool whose workers each hold a read-only copy of graph"""
+    return process_pool(processes, mp_context=mp_context,
+                        initializer=init_worker,
+                        initargs=(type(graph), graph.shared_state()))
+
+
+def windowed_map(executor, func, tasks, window):
+    """Yield func(*args) for each args tuple of tasks, in order
+
+    At most window tasks are submitted ahead of the result being waited
+    for, so memory stays bounded however long tasks is.
+    """
+    pending = deque()
+    for args in tasks:
+        pending.append(executor.submit(func, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()